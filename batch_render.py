@@ -0,0 +1,297 @@
+import argparse
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+
+from curves import NAME_TO_MODEL_CLASS
+from curves.base import MIN_DETAIL_LEVEL, MAX_DETAIL_LEVEL
+from project_io import read_project, apply_settings
+
+PROJECT_PATTERNS = ("*.curves", "*.pkl")
+FORMATS = ("svg", "png", "npz")
+# Blank border around the drawing, in pixels for png and scene units for svg.
+MARGIN = 10
+# Pens of curves saved without props, as in the editor.
+DEFAULT_PROPS = {
+    "point_color": (79, 106, 25, 255),
+    "point_size": 5,
+    "line_color": (79, 106, 25, 255),
+    "line_size": 1,
+}
+# Overlay pens of Curve.paint_control_curve and Curve.paint_convex_hull.
+CONTROL_LINE_COLOR = (255, 120, 65, 255)
+CONVEX_HULL_COLOR = (178, 34, 34, 255)
+
+application = None
+
+
+def init_worker(output_format):
+    # Only png output paints through Qt; svg and npz evaluate the curve models
+    # and never load it, which keeps the workers light.
+    global application
+    if output_format == "png":
+        # Must be set before Qt loads its platform plugin.
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtGui import QGuiApplication
+
+        application = QGuiApplication.instance() or QGuiApplication(["batch_render"])
+
+
+def load_models(file_name):
+    # (model, props, settings) per curve.
+    models = []
+    for name, control_points, props, settings, weights in read_project(file_name):
+        model = NAME_TO_MODEL_CLASS[name.split("-")[1]](control_points)
+        model.name = name
+        apply_settings(model, settings, weights)
+        models.append((model, props or DEFAULT_PROPS, settings))
+    return models
+
+
+def load_curves(file_name):
+    from config import NAME_TO_CURVE_CLASS
+
+    curves = []
+    for name, control_points, props, settings, weights in read_project(file_name):
+        curve = NAME_TO_CURVE_CLASS[name.split("-")[1]](control_points, props=props)
+        curve.name = name
+        apply_settings(curve, settings, weights)
+        curves.append(curve)
+    return curves
+
+
+def svg_paint(attribute, rgba):
+    r, g, b, a = rgba
+    return f'{attribute}="#{r:02x}{g:02x}{b:02x}" {attribute}-opacity="{a / 255:.3g}"'
+
+
+def svg_line(tag, points, rgba, width, fill='fill="none"'):
+    points = " ".join(f"{x:.6g},{y:.6g}" for x, y in points)
+    return (
+        f'<{tag} {fill} {svg_paint("stroke", rgba)} '
+        f'stroke-width="{width:g}" points="{points}"/>'
+    )
+
+
+def svg_squares(points, rgba, size):
+    # Qt draws points as squares of the pen width.
+    return [
+        f'<rect x="{x - size / 2:.6g}" y="{y - size / 2:.6g}" '
+        f'width="{size:g}" height="{size:g}" {svg_paint("fill", rgba)}/>'
+        for x, y in points
+    ]
+
+
+def export_npz(models, file_name, level):
+    arrays = {
+        model.name: model.get_points(level)
+        for model, _, _ in models
+        if len(model.control_points)
+    }
+    with open(file_name, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def export_svg(models, file_name, level):
+    # Covers the same area as the curves' bounding rects in the editor.
+    bounds = [
+        model.get_extent_bounds()
+        + (max(props["point_size"], props["line_size"]) / 2 + 1 + MARGIN)
+        * np.array([-1, -1, 1, 1])
+        for model, props, _ in models
+        if len(model.control_points)
+    ]
+    if bounds:
+        bounds = np.array(bounds)
+        x0, y0 = bounds[:, :2].min(axis=0)
+        x1, y1 = bounds[:, 2:].max(axis=0)
+    else:
+        x0 = y0 = -MARGIN
+        x1 = y1 = MARGIN
+    lines = [
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'viewBox="{x0:g} {y0:g} {x1 - x0:g} {y1 - y0:g}" '
+        f'width="{x1 - x0:g}" height="{y1 - y0:g}">'
+    ]
+    for model, props, settings in models:
+        if not len(model.control_points):
+            continue
+        # Same layers, in the same order, as Curve.paint. Like there, the
+        # bounding rect and hull are filled with the line pen's colour.
+        line_color, line_size = props["line_color"], props["line_size"]
+        line_fill = svg_paint("fill", line_color)
+        lines.append(f'<g id="{model.name}">')
+        if settings.get("show_points", True):
+            lines.extend(
+                svg_squares(
+                    model.control_points, props["point_color"], props["point_size"]
+                )
+            )
+        lines.append(
+            svg_line("polyline", model.get_points(level), line_color, line_size)
+        )
+        if settings.get("show_bounding_rect", False):
+            x, y, right, bottom = model.get_bounds()
+            lines.append(
+                f'<rect x="{x:.6g}" y="{y:.6g}" width="{right - x:.6g}" '
+                f'height="{bottom - y:.6g}" {line_fill} '
+                f'{svg_paint("stroke", line_color)} stroke-width="{line_size:g}"/>'
+            )
+            center = [((x + right) / 2, (y + bottom) / 2)]
+            lines.extend(svg_squares(center, line_color, line_size))
+        if settings.get("show_control_line", False):
+            lines.append(
+                svg_line("polyline", model.control_points, CONTROL_LINE_COLOR, 1)
+            )
+        if settings.get("show_convex_hull", False) and len(model.control_points) >= 3:
+            lines.append(
+                svg_line(
+                    "polygon", model.get_convex_hull(), CONVEX_HULL_COLOR, 1, line_fill
+                )
+            )
+        lines.append("</g>")
+    lines.append("</svg>")
+    with open(file_name, "w") as f:
+        f.write("\n".join(lines))
+
+
+def export_png(curves, file_name, size):
+    from PyQt6.QtCore import QRectF, Qt
+    from PyQt6.QtGui import QImage, QPainter
+
+    width, height = size
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(Qt.GlobalColor.white)
+    rect = QRectF()
+    for curve in curves:
+        if len(curve.control_points):
+            rect = rect.united(curve.boundingRect())
+    scale = min(
+        (width - 2 * MARGIN) / max(rect.width(), 1.0),
+        (height - 2 * MARGIN) / max(rect.height(), 1.0),
+    )
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.translate(width / 2, height / 2)
+    painter.scale(scale, scale)
+    painter.translate(-rect.center())
+    for curve in curves:
+        curve.paint(painter, None)
+    painter.end()
+    if not image.save(str(file_name)):
+        raise OSError(f"could not write {file_name}")
+
+
+def output_names(projects, output_format):
+    # Projects sharing a stem, like a.curves and a.pkl, keep their suffix so
+    # they do not overwrite each other's output.
+    stems = Counter(project.stem for project in projects)
+    names = {}
+    for project in projects:
+        name = project.stem if stems[project.stem] == 1 else project.name
+        names[project] = name + "." + output_format
+    return names
+
+
+def render_project(file_name, output, output_format, level, size):
+    if output_format == "png":
+        curves = load_curves(file_name)
+        export_png(curves, output, size)
+    else:
+        curves = load_models(file_name)
+        if output_format == "npz":
+            export_npz(curves, output, level)
+        else:
+            export_svg(curves, output, level)
+    return output, len(curves)
+
+
+def parse_size(text):
+    try:
+        width, height = map(int, text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width <= 2 * MARGIN or height <= 2 * MARGIN:
+        raise argparse.ArgumentTypeError(f"{text} is too small")
+    return width, height
+
+
+def parse_jobs(text):
+    try:
+        jobs = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number, got {text!r}")
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"needs at least one worker, got {jobs}")
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render or export the curves of every project in a "
+        "directory without starting the editor."
+    )
+    parser.add_argument("input", type=Path, help="directory of .curves/.pkl files")
+    parser.add_argument("output", type=Path, help="directory for the results")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="svg")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=parse_jobs,
+        default=None,
+        help="worker processes (all cores)",
+    )
+    parser.add_argument(
+        "-l",
+        "--level",
+        type=int,
+        default=0,
+        choices=range(MIN_DETAIL_LEVEL, MAX_DETAIL_LEVEL + 1),
+        help="tessellation detail level for svg and npz",
+    )
+    parser.add_argument(
+        "-s", "--size", type=parse_size, default=(1600, 1000), help="png WIDTHxHEIGHT"
+    )
+    args = parser.parse_args(argv)
+
+    projects = sorted(
+        path for pattern in PROJECT_PATTERNS for path in args.input.glob(pattern)
+    )
+    if not projects:
+        parser.error(f"no projects in {args.input}")
+    args.output.mkdir(parents=True, exist_ok=True)
+    outputs = output_names(projects, args.format)
+
+    failed = 0
+    with ProcessPoolExecutor(
+        args.jobs, initializer=init_worker, initargs=(args.format,)
+    ) as pool:
+        futures = {
+            pool.submit(
+                render_project,
+                project,
+                args.output / outputs[project],
+                args.format,
+                args.level,
+                args.size,
+            ): project
+            for project in projects
+        }
+        for future in as_completed(futures):
+            project = futures[future]
+            try:
+                output, count = future.result()
+            except Exception as error:
+                failed += 1
+                print(f"{project}: {type(error).__name__}: {error}", file=sys.stderr)
+            else:
+                print(f"{project} -> {output} ({count} curves)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
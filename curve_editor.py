@@ -5,10 +5,13 @@ from mode import EditorMode
 from properties import CurvePropertiesModel
 
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QApplication, QMainWindow, QInputDialog
 import sys
 
+# The properties panel follows scene changes at most this often.
+PROPERTIES_INTERVAL_MS = 100
+
 
 class EditorWindow(QMainWindow):
     def __init__(self, ui):
@@ -61,7 +64,12 @@ class CurveEditor(QApplication):
         self.ui.merge_signal.connect(self.merge_handler)
         self.ui.join_signal.connect(self.join_handler)
 
-        self.scene.update_occured.connect(self.move_handler)
+        self.properties_timer = QTimer(self)
+        self.properties_timer.setSingleShot(True)
+        self.properties_timer.setInterval(PROPERTIES_INTERVAL_MS)
+        self.properties_timer.timeout.connect(self.move_handler)
+        self.scene.update_occured.connect(self.schedule_properties_refresh)
+        self.aboutToQuit.connect(self.scene.tessellation_pool.shutdown)
 
         self.mode.switch_mode("None")
         self.main_window.setWindowState(Qt.WindowState.WindowMaximized)
@@ -183,9 +191,14 @@ class CurveEditor(QApplication):
 
                 new_points = b1.join_bezier_curves(b2, num)
 
+    def schedule_properties_refresh(self):
+        # Not restarted while pending, so a long drag still refreshes the
+        # panel every interval instead of only once it ends.
+        if not self.properties_timer.isActive():
+            self.properties_timer.start()
+
     def move_handler(self):
         self.model.setCurve(self.scene.current_object)
-        self.model.layoutChanged.emit()
 
     def change_object_selection(self):
         if len(self.scene.object_mapping.keys()) > 0:
@@ -196,7 +209,6 @@ class CurveEditor(QApplication):
                 ]
                 self.scene.current_object = obj
                 self.model.setCurve(self.scene.current_object)
-                self.model.layoutChanged.emit()
                 self.mode.switch_mode("Move")
 
     def curve_added(self):
@@ -205,7 +217,6 @@ class CurveEditor(QApplication):
         self.mode.switch_mode("Add curve points")
         self.internal_counter += 1
         self.model.setCurve(self.scene.current_object)
-        self.model.layoutChanged.emit()
 
 
 if __name__ == "__main__":
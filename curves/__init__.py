@@ -0,0 +1,16 @@
+from .base import CurveModel
+from .interpolated import NIFS3Model, LagrangeModel
+from .bezier import BezierModel, CubicBezierInterpModel, WeightedBezierModel
+from .bspline import BSplineModel, BSplineDeBoorModel
+
+# Same keys as config.NAME_TO_CURVE_CLASS, for evaluating curves without Qt.
+NAME_TO_MODEL_CLASS = {
+    "Control": CurveModel,
+    "NIFS3": NIFS3Model,
+    "Bezier": BezierModel,
+    "WeightedBezier": WeightedBezierModel,
+    "CubicBezierInterp": CubicBezierInterpModel,
+    "LagrangeCurve": LagrangeModel,
+    "BSpline": BSplineModel,
+    "BSplineDeBoor": BSplineDeBoorModel,
+}
@@ -0,0 +1,404 @@
+from math import log2
+from time import perf_counter
+import numpy as np
+from numpy.polynomial import chebyshev
+
+# Tessellation detail levels: level L samples 2**L times as densely as the
+# curve's own points_limit/tolerance, so each level covers a 2x zoom range.
+MIN_DETAIL_LEVEL = -4
+MAX_DETAIL_LEVEL = 3
+MIN_SAMPLES = 16
+
+# A curve whose tessellation once took longer than this is resampled on the
+# editor's tessellation pool from then on, instead of inside paint().
+BACKGROUND_TESSELLATION_MS = 8.0
+
+# Above this degree polynomial root finding for bounds gets too costly to run
+# on every edit, so curves fall back to a hull-based bound.
+MAX_BOUNDS_DEGREE = 48
+
+
+def geometry_attribute(name):
+    # Attribute whose reassignment changes the curve shape and so drops the
+    # cached tessellation. In-place edits must call invalidate() instead.
+    storage = "_" + name + "_value"
+
+    def getter(self):
+        return getattr(self, storage)
+
+    def setter(self, value):
+        setattr(self, storage, value)
+        self.invalidate()
+
+    return property(getter, setter)
+
+
+def is_qpoint(point):
+    # Points from Qt (QPointF, QPoint) are recognised by their accessors, so
+    # this module never has to import Qt.
+    return callable(getattr(point, "x", None))
+
+
+def point_array(points):
+    # Accepts an (N, 2) array, a sequence of QPointF or of (x, y) pairs.
+    if len(points) and is_qpoint(points[0]):
+        points = [(p.x(), p.y()) for p in points]
+    return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+
+def scale_detail_level(scale):
+    if scale <= 0:
+        return 0
+    level = round(log2(scale))
+    return max(MIN_DETAIL_LEVEL, min(MAX_DETAIL_LEVEL, level))
+
+
+def to_pair(point):
+    if is_qpoint(point):
+        return point.x(), point.y()
+    return tuple(point)
+
+
+def cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def half_hull(points):
+    chain = []
+    for p in points:
+        while len(chain) >= 2 and cross(chain[-2], chain[-1], p) <= 0:
+            chain.pop()
+        chain.append(p)
+    return chain
+
+
+def convex_hull(points):
+    # Andrew's monotone chain; returns the hull vertices in order, without
+    # collinear or repeated points.
+    points = np.unique(point_array(points), axis=0).tolist()
+    if len(points) < 3:
+        return np.array(points, dtype=np.float64).reshape(-1, 2)
+    lower = half_hull(points)
+    upper = half_hull(reversed(points))
+    return np.array(lower[:-1] + upper[:-1], dtype=np.float64)
+
+
+def point_bounds(points):
+    # (min x, min y, max x, max y)
+    return np.concatenate((points.min(axis=0), points.max(axis=0)))
+
+
+def chebyshev_interpolant(values):
+    # Coefficients of the polynomial through `values`, given at the Chebyshev
+    # nodes chebpts1(len(values)); one column per coordinate.
+    degree = len(values) - 1
+    nodes = chebyshev.chebpts1(degree + 1)
+    coefficients = chebyshev.chebvander(nodes, degree).T @ values
+    coefficients *= 2.0 / (degree + 1)
+    coefficients[0] /= 2
+    return coefficients
+
+
+def chebyshev_roots(coefficients, domain):
+    # Real roots of every column inside the open domain.
+    lo, hi = domain
+    t = []
+    for axis in range(coefficients.shape[1]):
+        roots = chebyshev.chebroots(coefficients[:, axis])
+        roots = roots[np.abs(roots.imag) < 1e-9].real
+        t.extend(lo + (roots[(roots > -1) & (roots < 1)] + 1) * (hi - lo) / 2)
+    return t
+
+
+def polynomial_bounds(evaluate, degree, domain):
+    # A polynomial curve is extreme at the ends of its domain or where the
+    # derivative of a coordinate vanishes. The roots come from an exact
+    # Chebyshev interpolant, which stays well conditioned at high degree; both
+    # coordinates share one evaluation at the Chebyshev nodes.
+    lo, hi = domain
+    nodes = chebyshev.chebpts1(degree + 1)
+    coefficients = chebyshev_interpolant(evaluate(lo + (nodes + 1) * (hi - lo) / 2))
+    t = list(domain) + chebyshev_roots(chebyshev.chebder(coefficients), domain)
+    return point_bounds(evaluate(np.array(t)))
+
+
+def rotate_about(points, center, degrees):
+    angle_rad = np.radians(degrees)
+    cos, sin = np.cos(angle_rad), np.sin(angle_rad)
+    translated_points = points - center
+    rotated_points = np.empty_like(translated_points)
+    rotated_points[:, 0] = translated_points[:, 0] * cos - translated_points[:, 1] * sin
+    rotated_points[:, 1] = translated_points[:, 0] * sin + translated_points[:, 1] * cos
+    return rotated_points + center
+
+
+def chord_deviation(start, end, points):
+    # Distance of each point from the chord start-end (or from start when the
+    # chord is degenerate); all arguments have shape (..., 2).
+    chord = end - start
+    offset = points - start
+    length = np.hypot(chord[..., 0], chord[..., 1])
+    cross = np.abs(chord[..., 0] * offset[..., 1] - chord[..., 1] * offset[..., 0])
+    distance = np.hypot(offset[..., 0], offset[..., 1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(length > 0, cross / length, distance)
+
+
+def adaptive_samples(evaluate, tolerance, max_points, initial_points=17):
+    # Refines a uniform start grid by bisecting every interval whose midpoint
+    # is further than `tolerance` from its chord, until all intervals are
+    # flat or max_points samples are in use.
+    t = np.linspace(0.0, 1.0, max(2, min(initial_points, max_points)))
+    points = evaluate(t)
+    while len(t) < max_points:
+        mid_t = (t[:-1] + t[1:]) / 2
+        mid = evaluate(mid_t)
+        deviation = chord_deviation(points[:-1], points[1:], mid)
+        split = np.flatnonzero(deviation > tolerance)
+        if len(split) == 0:
+            break
+        budget = max_points - len(t)
+        if len(split) > budget:
+            split = np.sort(split[np.argsort(deviation[split])[-budget:]])
+        t = np.insert(t, split + 1, mid_t[split])
+        points = np.insert(points, split + 1, mid[split], axis=0)
+    return points
+
+
+class CurveModel:
+    # Control points, settings and cached tessellation of a curve, without
+    # any Qt. Subclasses override the _uniform_points, _adaptive_points and
+    # _curve_bounds hooks; the editor's graphics items derive from these
+    # models and add painting on top.
+    points_limit = geometry_attribute("points_limit")
+    tessellation = geometry_attribute("tessellation")
+    tolerance = geometry_attribute("tolerance")
+    tessellation_modes = ("uniform", "adaptive")
+
+    def __init__(self, control_points=(), points_limit=1000, **kwargs):
+        super().__init__(**kwargs)
+        self.revision = 0
+        self._points = []
+        self._points_revision = None
+        self._detail_points = {}
+        self._slow_tessellation = False
+        self._hull_revision = None
+        self._hull = None
+        self._bounds_revision = None
+        self._bounds = None
+        self.control_points = control_points
+        self.points_limit = points_limit
+        self.tessellation = "uniform"
+        self.tolerance = 0.25
+        self.points = []
+        self.closed = False
+
+        self.current_rotation = None
+
+    @property
+    def control_points(self):
+        # (N, 2) float64 view into a buffer that grows geometrically, so that
+        # appending points is amortised O(1).
+        return self._control_buffer[: self._control_count]
+
+    @control_points.setter
+    def control_points(self, value):
+        self._control_buffer = point_array(value)
+        self._control_count = len(self._control_buffer)
+        self.invalidate()
+
+    @property
+    def leftmost_x(self):
+        return self.get_bounds()[0]
+
+    @property
+    def rightmost_x(self):
+        return self.get_bounds()[2]
+
+    @property
+    def highest_y(self):
+        return self.get_bounds()[1]
+
+    @property
+    def lowest_y(self):
+        return self.get_bounds()[3]
+
+    @property
+    def bounding_cords(self):
+        return [self.leftmost_x, self.rightmost_x, self.highest_y, self.lowest_y]
+
+    def get_bounds(self):
+        # Bounds of the curve itself; exact unless _curve_bounds says
+        # otherwise for a case.
+        if self._bounds_revision != self.revision:
+            points = self.control_points
+            if len(points):
+                self._bounds = self._curve_bounds(points)
+            else:
+                self._bounds = np.zeros(4)
+            self._bounds_revision = self.revision
+        return self._bounds
+
+    def _curve_bounds(self, points):
+        return point_bounds(points)
+
+    def _extent_bounds(self, points):
+        # Bounds that only need to contain the curve. Curves that stay inside
+        # their control points' hull override this with the points' bounds,
+        # so the scene can index them without solving for the exact bounds.
+        return self._curve_bounds(points)
+
+    def get_extent_bounds(self):
+        # (min x, min y, max x, max y) covering the curve and its control points.
+        points = self.control_points
+        if not len(points):
+            return np.zeros(4)
+        bounds = self._extent_bounds(points)
+        return np.concatenate(
+            (
+                np.minimum(bounds[:2], points.min(axis=0)),
+                np.maximum(bounds[2:], points.max(axis=0)),
+            )
+        )
+
+    def invalidate(self, keep_points=False):
+        # keep_points is for edits that already patched the cached
+        # tessellation in place, so it stays valid for the new revision.
+        self.revision += 1
+        if keep_points and self._points_revision == self.revision - 1:
+            self._points_revision = self.revision
+
+    def get_points(self, level=0):
+        if self._points_revision != self.revision:
+            self._detail_points = {}
+            self._points_revision = self.revision
+        if level not in self._detail_points:
+            start = perf_counter()
+            self._detail_points[level] = self._get_points(level)
+            if (perf_counter() - start) * 1000 > BACKGROUND_TESSELLATION_MS:
+                self._slow_tessellation = True
+        self._points = self._detail_points[level]
+        return self._points
+
+    def has_points(self, level=0):
+        return self._points_revision == self.revision and level in self._detail_points
+
+    def store_points(self, revision, level, points):
+        # Result of a tessellation run elsewhere, e.g. on a worker thread. It
+        # is cached only if the curve has not changed since; None marks a
+        # failed job and turns background sampling off again.
+        if points is None:
+            if revision == self.revision:
+                self._slow_tessellation = False
+            return
+        if revision == self.revision and not self.has_points(level):
+            if self._points_revision != self.revision:
+                self._detail_points = {}
+                self._points_revision = self.revision
+            self._detail_points[level] = points
+
+    def snapshot(self):
+        # Copy to sample on a worker thread while this curve is edited in
+        # place. It is a plain model of the same curve type with copies of
+        # the arrays (control points, weights); everything else is shared, as
+        # sampling only reads the settings, which are replaced, not mutated.
+        model_class = next(
+            cls
+            for cls in type(self).__mro__
+            if all(
+                issubclass(base, CurveModel) or base is object for base in cls.__mro__
+            )
+        )
+        model = model_class.__new__(model_class)
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            model.__dict__[name] = value
+        model._control_buffer = self.control_points.copy()
+        return model
+
+    def sample_count(self, level=0):
+        # Uniform samples at a detail level; local patches of the cached
+        # tessellation rebuild the same parameter grid from it.
+        return max(MIN_SAMPLES, int(self.points_limit * 2.0**level))
+
+    def _get_points(self, level=0):
+        points = self.control_points
+        if self.tessellation == "adaptive":
+            max_points = self.sample_count(max(level, 0))
+            tolerance = self.tolerance / 2.0**level
+            curve = self._adaptive_points(points, tolerance, max_points)
+        else:
+            curve = self._uniform_points(points, self.sample_count(level))
+        return np.array(curve, dtype=np.float64).reshape(-1, 2)
+
+    def _uniform_points(self, points, count):
+        return points
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        return points
+
+    def get_convex_hull(self):
+        if self._hull_revision != self.revision:
+            self._hull = convex_hull(self.control_points)
+            self._hull_revision = self.revision
+        return self._hull
+
+    def rotation_step(self, target_deg):
+        # Angle to turn by when a rotation drag reaches target_deg.
+        if self.current_rotation == None:
+            self.current_rotation = target_deg
+        else:
+            temp = target_deg
+            diff = self.current_rotation - target_deg
+            target_deg = diff
+            self.current_rotation = temp
+        return target_deg
+
+    def rotate_points(self, target_deg):
+        angle = self.rotation_step(target_deg)
+        # The centroid is unchanged by the rotation, so it stays a fixed pivot
+        # over the whole drag.
+        points = self.control_points
+        if len(points) == 0:
+            return
+        self.control_points = rotate_about(points, points.mean(axis=0), angle)
+
+    def add_control_point(self, point):
+        x, y = to_pair(point)
+        hull_cached = self._hull_revision == self.revision
+
+        if self._control_count == len(self._control_buffer):
+            buffer = np.empty((max(8, 2 * self._control_count), 2))
+            buffer[: self._control_count] = self.control_points
+            self._control_buffer = buffer
+        self._control_buffer[self._control_count] = x, y
+        self._control_count += 1
+        self.invalidate()
+
+        # Only the previous hull vertices and the new point can be on the hull.
+        if hull_cached:
+            self._hull = convex_hull(np.vstack((self._hull, (x, y))))
+            self._hull_revision = self.revision
+
+    def pickable_indices(self):
+        # Control points that can be picked for dragging or removal.
+        return np.arange(len(self.control_points))
+
+    def move_control_point(self, index, diff):
+        self.control_points[index] += to_pair(diff)
+        self.invalidate()
+
+    def remove_control_point(self, index):
+        self.control_points = np.delete(self.control_points, index, axis=0)
+
+    def add_diff(self, diff, diff_x, diff_y):
+        points = self.control_points
+        points += (diff_x, diff_y)
+        self.invalidate()
+
+    def get_type(self):
+        return self.name.split("-")[1]
+
+    def get_id(self):
+        return self.name.split("-")[0]
@@ -0,0 +1,555 @@
+from .base import (
+    CurveModel,
+    geometry_attribute,
+    chord_deviation,
+    point_array,
+    to_pair,
+    point_bounds,
+    polynomial_bounds,
+    chebyshev_interpolant,
+    chebyshev_roots,
+    rotate_about,
+    MAX_BOUNDS_DEGREE,
+)
+from functools import lru_cache
+import numpy as np
+from numpy.polynomial import chebyshev
+
+
+@lru_cache(maxsize=32)
+def bernstein_basis(degree, steps):
+    # Row i is B(i, degree) sampled at `steps` parameters. Built with the
+    # recurrence B(i, k) = (1 - t) B(i, k - 1) + t B(i - 1, k - 1), which only
+    # forms convex combinations, so it neither overflows nor loses precision
+    # at high degree the way comb(n, i) * t^i * (1 - t)^(n - i) does.
+    t = np.linspace(0.0, 1.0, steps)
+    basis = np.zeros((degree + 1, steps))
+    basis[0] = 1.0
+    for k in range(1, degree + 1):
+        basis[1 : k + 1] = (1 - t) * basis[1 : k + 1] + t * basis[:k]
+        basis[0] *= 1 - t
+    basis.setflags(write=False)
+    return basis
+
+
+def bezier_curve(points, steps=1000):
+    basis = bernstein_basis(len(points) - 1, steps)
+    return basis.T @ points
+
+
+def weighted_bezier_curve(points, weights, steps=1000):
+    if len(weights) != len(points):
+        raise ValueError(f"{len(weights)} weights for {len(points)} control points")
+    weighted_basis = bernstein_basis(len(points) - 1, steps) * weights[:, None]
+    return (weighted_basis.T @ points) / np.sum(weighted_basis, axis=0)[:, None]
+
+
+def de_casteljau(points, t, get_coeffs=False):
+    # Runs the recurrence for every value of `t` at once: each level has shape
+    # t.shape + (points left, dim), so a scalar t gives the classic result.
+    t = np.asarray(t, dtype=float)
+    s = t.reshape(t.shape + (1,) * points.ndim)
+    level = np.broadcast_to(points, t.shape + points.shape)
+    coefficients = [level]
+
+    for _ in range(points.shape[-2] - 1):
+        level = (1 - s) * level[..., :-1, :] + s * level[..., 1:, :]
+        if get_coeffs:
+            coefficients.append(level)
+
+    if get_coeffs:
+        return coefficients
+
+    return level[..., 0, :]
+
+
+def de_casteljau_curve(points, steps=1000):
+    return de_casteljau(points, np.linspace(0.0, 1.0, steps))
+
+
+def split_bezier(points, u=0.5):
+    # Works on a single control polygon or a batch of shape (k, n, dim).
+    coeffs = de_casteljau(points, u, get_coeffs=True)
+    left = np.stack([c[..., 0, :] for c in coeffs], axis=-2)
+    right = np.stack([c[..., -1, :] for c in reversed(coeffs)], axis=-2)
+    return left, right
+
+
+def cubic_bezier_bounds(segments):
+    # Each coordinate of a cubic segment (k, 4, 2) has a quadratic derivative
+    # a t^2 + b t + c, so its extrema are at the ends or at those roots in (0, 1).
+    p0, p1, p2, p3 = np.moveaxis(segments, 1, 0)
+    d0, d1, d2 = p1 - p0, p2 - p1, p3 - p2
+    a = d0 - 2 * d1 + d2
+    b = 2 * (d1 - d0)
+    c = d0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Stable form of the quadratic formula; also covers a == 0.
+        q = -(b + np.where(b < 0, -1.0, 1.0) * np.sqrt(b * b - 4 * a * c)) / 2
+        t = np.stack((q / a, c / q))
+    t = np.where((t > 0) & (t < 1), t, 0.0)
+    s = 1 - t
+    extrema = s**3 * p0 + 3 * s**2 * t * p1 + 3 * s * t**2 * p2 + t**3 * p3
+    return point_bounds(np.concatenate((extrema.reshape(-1, 2), p0, p3)))
+
+
+def bezier_bounds(points):
+    degree = len(points) - 1
+    if degree == 3:
+        return cubic_bezier_bounds(points[None])
+    if degree == 0 or degree > MAX_BOUNDS_DEGREE:
+        # Not exact: the control points' box.
+        return point_bounds(points)
+    return polynomial_bounds(lambda t: de_casteljau(points, t), degree, (0.0, 1.0))
+
+
+def rational_bezier_bounds(points, weights):
+    # A coordinate X / W of a rational curve is extreme at the ends or where
+    # X' W - X W' vanishes, a polynomial of degree 2n - 2 whose roots come
+    # from its Chebyshev interpolant. Needs positive weights, so W > 0.
+    n = len(points) - 1
+    if n == 0:
+        return point_bounds(points)
+    homogeneous = np.column_stack((points * weights[:, None], weights))
+    derivative = n * np.diff(homogeneous, axis=0)
+    t = (chebyshev.chebpts1(2 * n - 1) + 1) / 2
+    h, d = de_casteljau(homogeneous, t), de_casteljau(derivative, t)
+    numerator = d[:, :2] * h[:, 2:] - h[:, :2] * d[:, 2:]
+    t = [0.0, 1.0] + chebyshev_roots(chebyshev_interpolant(numerator), (0.0, 1.0))
+    h = de_casteljau(homogeneous, np.array(t))
+    return point_bounds(h[:, :2] / h[:, 2:])
+
+
+def adaptive_bezier(segments, tolerance, max_points, rational=False):
+    # Subdivides a batch of Bezier segments (k, n, dim) with de Casteljau until
+    # every control polygon lies within `tolerance` of its chord, keeping the
+    # segments in parameter order. Rational segments are given in homogeneous
+    # coordinates (x * w, y * w, w).
+    def project(points):
+        return points[..., :2] / points[..., 2:] if rational else points
+
+    while len(segments) < max_points - 1:
+        polygon = project(segments)
+        deviation = np.max(
+            chord_deviation(polygon[:, :1], polygon[:, -1:], polygon), axis=1
+        )
+        split = np.flatnonzero(deviation > tolerance)
+        if len(split) == 0:
+            break
+        budget = max_points - 1 - len(segments)
+        if len(split) > budget:
+            split = np.sort(split[np.argsort(deviation[split])[-budget:]])
+        left, right = split_bezier(segments[split])
+        segments = segments.copy()
+        segments[split] = left
+        segments = np.insert(segments, split + 1, right, axis=0)
+
+    return project(np.concatenate((segments[:, 0], segments[-1:, -1])))
+
+
+def cubic_bezier_sweep(points, sweep):
+    # Forward elimination (Thomas algorithm) of the regular rows 0..n-2 of the
+    # tridiagonal system for the inner Bezier points. Row i depends only on
+    # points i and i + 1, so `sweep` = (c', d') is extended in place and can be
+    # reused after appending points; truncate it from row j - 1 when point j
+    # changes.
+    c_prime, d_prime = sweep
+    for i in range(len(c_prime), len(points) - 2):
+        if i == 0:
+            c_prime.append(0.5)
+            d_prime.append((points[0] + 2 * points[1]) / 2)
+        else:
+            denom = 4.0 - c_prime[i - 1]
+            rhs = 2 * (2 * points[i] + points[i + 1])
+            c_prime.append(1.0 / denom)
+            d_prime.append((rhs - d_prime[i - 1]) / denom)
+    return sweep
+
+
+def get_cubic_bezier_coef(points, sweep=None):
+    n = len(points) - 1
+    if n == 1:
+        return np.array([(2 * points[0] + points[1]) / 3]), np.array(
+            [(points[0] + 2 * points[1]) / 3]
+        )
+
+    c_prime, d_prime = cubic_bezier_sweep(points, sweep or ([], []))
+
+    A = np.empty((n, points.shape[1]))
+    denom = 7.0 - 2 * c_prime[n - 2]
+    A[n - 1] = (8 * points[n - 1] + points[n] - 2 * d_prime[n - 2]) / denom
+    for i in range(n - 2, -1, -1):
+        A[i] = d_prime[i] - c_prime[i] * A[i + 1]
+
+    B = np.empty_like(A)
+    B[:-1] = 2 * points[1:-1] - A[1:]
+    B[n - 1] = (A[n - 1] + points[n]) / 2
+
+    return A, B
+
+
+import numpy as np
+
+
+def combine_bezier_curves(curve1, curve2, c=2):
+
+    n = curve1.shape[0]
+    m = curve2.shape[0]
+
+    if c == 0:
+        return np.concatenate((curve1[-1:], curve2[1:]))
+
+    if c == 1:
+        pn = curve1[-1]
+        pn_1 = curve1[-2]
+
+        q0 = pn
+        q1 = ((m + n) * pn - n * pn_1) / m
+
+        return np.concatenate(([q0, q1], curve2[2:]))
+
+    if c == 2:
+        pn = curve1[-1]
+        pn_1 = curve1[-2]
+        pn_2 = curve1[-3]
+
+        q0 = curve2[0]
+        q1 = curve2[1]
+        q2 = curve2[2]
+
+        pn = curve1[-1]
+        pn_1 = curve1[-2]
+
+        q0 = pn
+        q1 = ((m + n) * pn - n * pn_1) / m
+        q2 = (
+            (n - 1) * (n * pn - 2 * n * pn_1 + n * pn_2)
+            + (2 * m * m - 2 * m) * q1
+            - (m * m - m) * q0
+        )
+        q2 = q2 / (m * m - m)
+
+        return np.concatenate(([q0, q1, q2], curve2[3:]))
+
+
+class BezierModel(CurveModel):
+    evaluation = geometry_attribute("evaluation")
+    evaluation_modes = {
+        "bernstein": bezier_curve,
+        "de_casteljau": de_casteljau_curve,
+    }
+
+    def __init__(self, control_points=(), points_limit=1000, **kwargs):
+        super().__init__(control_points, points_limit, **kwargs)
+        self.evaluation = "bernstein"
+
+    def _uniform_points(self, points, count):
+        return self.evaluation_modes[self.evaluation](points, count)
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        return adaptive_bezier(points[None], tolerance, max_points)
+
+    def _curve_bounds(self, points):
+        return bezier_bounds(points)
+
+    def _extent_bounds(self, points):
+        return point_bounds(points)
+
+    def elevate_degree(self):
+        n = len(self.control_points)
+        new_points = [self.control_points[0]]
+        for i in range(1, n):
+            new_points.append(
+                i / n * self.control_points[i - 1]
+                + (1 - i / n) * self.control_points[i]
+            )
+        new_points.append(self.control_points[n - 1])
+        self.control_points = new_points
+
+    def reduce_degree(self):
+        control_points = self.control_points
+        n = len(control_points)
+
+        M = np.zeros((n, n - 1))
+        B = self.control_points
+        M[0, 0] = 1
+        M[n - 1, n - 2] = 1
+        for i in range(n - 1):
+            M[i, i - 1] = i / n
+            M[i, i] = 1 - i / n
+
+        B_0 = np.linalg.solve(M.T @ M, M.T @ B)
+
+        self.control_points = np.vstack((B[:1], B_0[1:-1], B[-1:]))
+
+    def reduce_degree2(self):
+        control_points = self.control_points
+        n = len(control_points) - 1
+        new_control_points = [control_points[0]]
+
+        for i in range(1, n - 1):
+            t = i / n
+            new_point = (1 - t) * control_points[i] + t * control_points[i + 1]
+            new_control_points.append(new_point)
+
+        new_control_points.append(control_points[-1])
+        self.control_points = new_control_points
+
+    def get_split_points(self, u=0.5):
+        return split_bezier(self.control_points, u)
+
+    def merge_bezier_curves(self, other, continuity=2):
+        return combine_bezier_curves(
+            self.control_points, other.control_points, c=continuity
+        )
+
+    def join_bezier_curves(self, other, continuity=2):
+        other.control_points = combine_bezier_curves(
+            self.control_points, other.control_points, c=continuity
+        )
+        return
+
+
+class WeightedBezierModel(CurveModel):
+    weights = geometry_attribute("weights")
+
+    def __init__(self, control_points=(), points_limit=1000, **kwargs):
+        super().__init__(control_points, points_limit, **kwargs)
+        self.weights = np.ones(len(control_points))
+
+    def add_control_point(self, point):
+        # Stored past the setter, as the point edit invalidates anyway; a
+        # second revision bump would drop the incrementally updated hull.
+        self._weights_value = np.append(self.weights, 1)
+        super().add_control_point(point)
+
+    def remove_control_point(self, index):
+        self._weights_value = np.delete(self.weights, index)
+        super().remove_control_point(index)
+
+    def _uniform_points(self, points, count):
+        return weighted_bezier_curve(points, self.weights, count)
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        homogeneous = np.column_stack((points * self.weights[:, None], self.weights))
+        return adaptive_bezier(homogeneous[None], tolerance, max_points, rational=True)
+
+    def _curve_bounds(self, points):
+        weights = self.weights
+        if len(weights) != len(points):
+            # Weights assigned by hand that do not fit the points (yet).
+            return point_bounds(points)
+        if np.all(weights > 0):
+            if np.all(weights == weights[0]):
+                return bezier_bounds(points)
+            if 2 * len(points) - 4 <= MAX_BOUNDS_DEGREE:
+                return rational_bezier_bounds(points, weights)
+            # Not exact: the curve stays inside its control polygon's hull.
+            return point_bounds(points)
+        # Not exact: with a zero or negative weight the curve can run off to
+        # infinity, so only its finite samples are bounded.
+        curve = self._uniform_points(points, self.points_limit)
+        return point_bounds(curve[np.isfinite(curve).all(axis=1)])
+
+    def _extent_bounds(self, points):
+        if len(self.weights) == len(points) and np.all(self.weights > 0):
+            return point_bounds(points)
+        return self._curve_bounds(points)
+
+    def change_weight(self, idx, value):
+        self.weights[idx] = value
+        self.invalidate()
+
+    def elevate_degree(self):
+        n = len(self.control_points)
+
+        new_weights = [self.weights[0]]
+        for i in range(1, n):
+            new_weights.append(
+                i / n * self.weights[i - 1] + (1 - i / n) * self.weights[i]
+            )
+        new_weights.append(self.weights[n - 1])
+
+        new_points = [self.control_points[0]]
+        for i in range(1, n):
+            new_points.append(
+                (
+                    (i / n) * self.weights[i - 1] * self.control_points[i - 1]
+                    + (1 - i / n) * self.weights[i] * self.control_points[i]
+                )
+                / (self.weights[i - 1] * (i / n) + (1 - i / n) * self.weights[i])
+            )
+        new_points.append(self.control_points[n - 1])
+
+        self.control_points = new_points
+        self.weights = np.array(new_weights)
+
+    def reduce_degree(self):
+        new_points = [self.control_points[0]]
+        new_weights = [self.weights[0]]
+
+        for i in range(1, len(self.control_points) - 2):
+            alpha = self.weights[i] / (self.weights[i] + self.weights[i + 1])
+            new_control_point = (
+                alpha * self.control_points[i]
+                + (1 - alpha) * self.control_points[i + 1]
+            )
+            new_weight = self.weights[i] + self.weights[i + 1]
+            new_points.append(new_control_point)
+            new_weights.append(new_weight)
+
+        new_points.append(self.control_points[-1])
+        new_weights.append(self.weights[-1])
+
+        self.control_points = new_points
+        self.weights = np.array(new_weights)
+
+    def reduce_degree(self):
+        control_points = self.control_points
+        new_weights = [self.weights[0]]
+        n = len(control_points)
+
+        M = np.zeros((n, n - 1))
+        B = self.control_points
+        M[0, 0] = self.weights[0]
+        M[n - 1, n - 2] = self.weights[-1]
+        for i in range(0, n - 1):
+            M[i, i - 1] = i / n * self.weights[i - 1]
+            M[i, i] = 1 - (i / n) * self.weights[i]
+            new_weights.append(
+                i / n * self.weights[i - 1] + 1 - (i / n) * self.weights[i]
+            )
+
+        B_0 = np.linalg.solve(M.T @ M, M.T @ B)
+
+        self.control_points = np.vstack((B[:1], B_0[1:-1], B[-1:]))
+        self.weights = np.array(new_weights)
+
+
+def interpolation_nodes(control_points):
+    # Saved cubic interpolation curves hold the expanded [P_i, A_i, B_i, P_i+1]
+    # segments; anything else is taken as the interpolation points themselves.
+    # Two segments are needed to tell them apart, so a lone segment counts as
+    # four points, e.g. when a 4-point Bezier is switched to this type. The
+    # project format saves the nodes as well, which settles it.
+    n = len(control_points)
+    if n >= 8 and n % 4 == 0:
+        if np.array_equal(control_points[3:-1:4], control_points[4::4]):
+            return np.vstack((control_points[0::4], control_points[-1:]))
+    return control_points.copy()
+
+
+class CubicBezierInterpModel(CurveModel):
+    def __init__(self, control_points=(), points_limit=1000, **kwargs):
+        super().__init__([], points_limit, **kwargs)
+        control_points = point_array(control_points)
+        self._control_points = interpolation_nodes(control_points)
+        self._sweep = ([], [])
+        if len(control_points) == 4 * (len(self._control_points) - 1):
+            # Keep saved handles as they are until the curve is edited.
+            self.control_points = control_points
+        else:
+            self._rebuild()
+
+    @property
+    def nodes(self):
+        # Interpolation points, as a list so that they are saved with the
+        # project settings.
+        return self._control_points.tolist()
+
+    @nodes.setter
+    def nodes(self, value):
+        nodes = point_array(value)
+        if not np.array_equal(nodes, self._control_points):
+            self._control_points = nodes
+            self._sweep = ([], [])
+            self._rebuild()
+
+    def _rebuild(self, changed_node=None):
+        if changed_node is not None:
+            del self._sweep[0][max(0, changed_node - 1) :]
+            del self._sweep[1][max(0, changed_node - 1) :]
+        points = self._control_points
+        if len(points) < 2:
+            self.control_points = []
+            return
+
+        A, B = get_cubic_bezier_coef(points, self._sweep)
+        self.control_points = np.stack((points[:-1], A, B, points[1:]), axis=1).reshape(
+            -1, 2
+        )
+
+    def _node_index(self, index):
+        segment, offset = divmod(index, 4)
+        if offset == 0:
+            return segment
+        if offset == 3:
+            return segment + 1
+        return None
+
+    def pickable_indices(self):
+        # The nodes, once each: the start of every segment and the last end.
+        n = len(self.control_points)
+        if n == 0:
+            return np.arange(0)
+        return np.append(np.arange(0, n, 4), n - 1)
+
+    def add_control_point(self, point):
+        x, y = to_pair(point)
+        self._control_points = np.vstack((self._control_points, (x, y)))
+        self._rebuild()
+
+    def move_control_point(self, index, diff):
+        # The inner handles are derived from the interpolation points, so only
+        # the latter can be dragged.
+        node = self._node_index(index)
+        if node is not None:
+            self._control_points[node] += to_pair(diff)
+            self._rebuild(changed_node=node)
+
+    def remove_control_point(self, index):
+        node = self._node_index(index)
+        if node is not None:
+            self._control_points = np.delete(self._control_points, node, axis=0)
+            self._rebuild(changed_node=node)
+
+    def add_diff(self, diff, diff_x, diff_y):
+        super().add_diff(diff, diff_x, diff_y)
+        self._control_points += (diff_x, diff_y)
+        self._sweep = ([], [])
+
+    def rotate_points(self, target_deg):
+        # The nodes turn with the segments instead of being read back from
+        # them, as a lone node has no segment yet.
+        angle = self.rotation_step(target_deg)
+        nodes, points = self._control_points, self.control_points
+        if len(nodes) == 0:
+            return
+        center = (points if len(points) else nodes).mean(axis=0)
+        self._control_points = rotate_about(nodes, center, angle)
+        self._sweep = ([], [])
+        self.control_points = rotate_about(points, center, angle)
+
+    def _uniform_points(self, points, count):
+        n = len(points)
+        if n <= 1:
+            return points
+        ret = []
+        points_per_segment = max(2, count // ((n) // 3))
+        for i in range(0, n, 4):
+            ret.extend(bezier_curve(np.array(points[i : i + 4]), points_per_segment))
+        return ret
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        if len(points) < 4:
+            return points
+        segments = points[: len(points) // 4 * 4].reshape(-1, 4, 2)
+        return adaptive_bezier(segments, tolerance, max_points)
+
+    def _curve_bounds(self, points):
+        if len(points) < 4:
+            return point_bounds(points)
+        return cubic_bezier_bounds(points[: len(points) // 4 * 4].reshape(-1, 4, 2))
+
+    def _extent_bounds(self, points):
+        return point_bounds(points)
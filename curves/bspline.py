@@ -0,0 +1,205 @@
+from .base import (
+    CurveModel,
+    geometry_attribute,
+    adaptive_samples,
+    to_pair,
+    point_bounds,
+)
+from functools import lru_cache
+from scipy import interpolate
+import numpy as np
+
+
+def clamped_knot_vector(n, degree):
+    knots = np.linspace(0, 1, n - degree + 1)
+    return np.concatenate((np.zeros(degree), knots, np.ones(degree)))
+
+
+def basis_matrix(knots, degree, t):
+    # Cox-de Boor recurrence run for all parameters at once; row i holds the
+    # values of every basis function at t[i].
+    t = t[:, None]
+    basis = ((knots[:-1] <= t) & (t < knots[1:])).astype(float)
+    # Close the last non-empty span so that t = 1 lands on the final point.
+    last_span = np.flatnonzero(knots[:-1] < knots[1:])[-1]
+    basis[t[:, 0] == knots[last_span + 1], last_span] = 1.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p in range(1, degree + 1):
+            left_den = knots[p:-1] - knots[: -p - 1]
+            right_den = knots[p + 1 :] - knots[1:-p]
+            left = np.where(left_den > 0, (t - knots[: -p - 1]) / left_den, 0.0)
+            right = np.where(right_den > 0, (knots[p + 1 :] - t) / right_den, 0.0)
+            basis = left * basis[:, :-1] + right * basis[:, 1:]
+
+    return basis
+
+
+def nonzero_basis(knots, degree, t):
+    # Only the degree + 1 basis functions of the knot span holding t can be
+    # nonzero there. They come from the triangular recurrence (Piegl and
+    # Tiller, A2.2) run for all parameters at once. Returns the control point
+    # index of each value and the values, both of shape (len(t), degree + 1).
+    n = len(knots) - degree - 1
+    span = np.clip(np.searchsorted(knots, t, side="right") - 1, degree, n - 1)
+    values = np.ones((len(t), degree + 1))
+    left = np.empty((degree + 1, len(t)))
+    right = np.empty((degree + 1, len(t)))
+    for j in range(1, degree + 1):
+        left[j] = t - knots[span + 1 - j]
+        right[j] = knots[span + j] - t
+        saved = np.zeros(len(t))
+        for r in range(j):
+            temp = values[:, r] / (right[r + 1] + left[j - r])
+            values[:, r] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        values[:, j] = saved
+    return span[:, None] - degree + np.arange(degree + 1), values
+
+
+@lru_cache(maxsize=16)
+def bspline_basis(n, degree, points_limit):
+    # Sparse basis: its size grows with the sample count, not with n.
+    t = np.linspace(0.0, 1.0, points_limit)
+    index, values = nonzero_basis(clamped_knot_vector(n, degree), degree, t)
+    index.setflags(write=False)
+    values.setflags(write=False)
+    return index, values
+
+
+def evaluate_bspline(control_points, index, values):
+    return np.einsum("ij,ijk->ik", values, control_points[index])
+
+
+def bspline(control_points, degree, points_limit=1000):
+    basis = bspline_basis(len(control_points), degree, points_limit)
+    return evaluate_bspline(control_points, *basis)
+
+
+def de_boor(control_points, degree, t):
+    # De Boor's algorithm for every parameter at once: d has shape
+    # (len(t), degree + 1, 2) and the triangular recurrence runs over it.
+    n = len(control_points)
+    knots = clamped_knot_vector(n, degree)
+    span = np.clip(np.searchsorted(knots, t, side="right") - 1, degree, n - 1)
+
+    d = control_points[span[:, None] - degree + np.arange(degree + 1)]
+    for r in range(1, degree + 1):
+        j = np.arange(r, degree + 1)
+        lo = knots[span[:, None] + j - degree]
+        hi = knots[span[:, None] + j + 1 - r]
+        alpha = ((t[:, None] - lo) / (hi - lo))[:, :, None]
+        d[:, r:] = (1.0 - alpha) * d[:, r - 1 : -1] + alpha * d[:, r:]
+
+    return d[:, degree]
+
+
+def spline_extrema(knots, coefficients, degree):
+    # Parameters where a coordinate of a spline curve has zero derivative,
+    # found piece by piece over the knot spans.
+    t = []
+    for c in coefficients:
+        spline = interpolate.PPoly.from_spline((knots, c, degree))
+        roots = spline.derivative().roots(extrapolate=False)
+        t.extend(roots[np.isfinite(roots)])
+    return t
+
+
+def bspline_bounds(control_points, degree):
+    knots = clamped_knot_vector(len(control_points), degree)
+    t = [0.0, 1.0] + spline_extrema(knots, control_points.T, degree)
+    # de Boor only touches the span of each parameter, unlike a dense basis.
+    return point_bounds(de_boor(control_points, degree, np.clip(t, 0.0, 1.0)))
+
+
+def move_bspline_control_point(curve, index, diff):
+    # A control point only influences the knot spans [index, index + degree + 1),
+    # so cached uniform tessellations are patched over that parameter range
+    # with the point's basis function instead of being rebuilt.
+    n, degree = len(curve.control_points), curve.degree
+    diff = np.asarray(to_pair(diff))
+    curve.control_points[index] += diff
+    cached = curve._points_revision == curve.revision
+    if not cached or curve.tessellation != "uniform" or degree == 0 or n <= degree:
+        curve.invalidate()
+        return
+
+    knots = clamped_knot_vector(n, degree)
+    local_knots = knots[index : index + degree + 2]
+    for level, points in curve._detail_points.items():
+        t = np.linspace(0.0, 1.0, curve.sample_count(level))
+        lo = np.searchsorted(t, local_knots[0], side="left")
+        hi = np.searchsorted(t, local_knots[-1], side="right")
+        weights = basis_matrix(local_knots, degree, t[lo:hi])[:, :1]
+        points[lo:hi] += weights * diff
+    curve.invalidate(keep_points=True)
+
+
+class BSplineDeBoorModel(CurveModel):
+    degree = geometry_attribute("degree")
+
+    def __init__(self, control_points=(), points_limit=1000, **kwargs):
+        super().__init__(control_points, points_limit, **kwargs)
+        self.degree = 3
+
+    def move_control_point(self, index, diff):
+        move_bspline_control_point(self, index, diff)
+
+    def _curve_bounds(self, points):
+        if self.degree == 0 or len(points) < self.degree + 1:
+            return point_bounds(points)
+        return bspline_bounds(points, self.degree)
+
+    def _extent_bounds(self, points):
+        return point_bounds(points)
+
+    def _uniform_points(self, points, count):
+        if len(points) < self.degree + 1:
+            return points
+        t = np.linspace(0.0, 1.0, count)
+        return de_boor(points, self.degree, t)
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        if len(points) < self.degree + 1:
+            return points
+        return adaptive_samples(
+            lambda t: de_boor(points, self.degree, t),
+            tolerance,
+            max_points,
+            4 * len(points),
+        )
+
+
+class BSplineModel(CurveModel):
+    degree = geometry_attribute("degree")
+
+    def __init__(self, control_points=(), points_limit=1000, **kwargs):
+        super().__init__(control_points, points_limit, **kwargs)
+        self.degree = 3
+
+    def move_control_point(self, index, diff):
+        move_bspline_control_point(self, index, diff)
+
+    def _curve_bounds(self, points):
+        if self.degree == 0 or len(points) < self.degree + 1:
+            return point_bounds(points)
+        return bspline_bounds(points, self.degree)
+
+    def _extent_bounds(self, points):
+        return point_bounds(points)
+
+    def _uniform_points(self, points, count):
+        if len(points) < self.degree + 1:
+            return points
+        return bspline(points, self.degree, count)
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        if len(points) < self.degree + 1:
+            return points
+        knots = clamped_knot_vector(len(points), self.degree)
+        return adaptive_samples(
+            lambda t: evaluate_bspline(points, *nonzero_basis(knots, self.degree, t)),
+            tolerance,
+            max_points,
+            4 * len(points),
+        )
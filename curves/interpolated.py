@@ -0,0 +1,156 @@
+from .base import (
+    CurveModel,
+    adaptive_samples,
+    point_bounds,
+    polynomial_bounds,
+    MAX_BOUNDS_DEGREE,
+)
+from .bspline import spline_extrema
+from functools import lru_cache
+from scipy import interpolate
+from scipy.special import gammaln
+import numpy as np
+
+
+def barycentric_weights(x):
+    diff = x[:, None] - x[None, :]
+    np.fill_diagonal(diff, 1.0)
+    return 1.0 / np.prod(diff, axis=1)
+
+
+def lagrange_basis_matrix(x, x_interp, weights=None):
+    # Second (true) barycentric form: row i holds l_j(x_interp[i]) for every
+    # node, so any set of values is interpolated with one matrix product.
+    if weights is None:
+        weights = barycentric_weights(x)
+    diff = x_interp[:, None] - x[None, :]
+    rows, cols = np.nonzero(diff == 0)
+    diff[rows, cols] = 1.0
+
+    terms = weights / diff
+    with np.errstate(divide="ignore", invalid="ignore"):
+        basis = terms / np.sum(terms, axis=1, keepdims=True)
+    basis[rows] = 0.0
+    basis[rows, cols] = 1.0
+    return basis
+
+
+def equispaced_weights(n):
+    # Barycentric weights of the nodes 0..n-1 are (-1)^j * C(n - 1, j); they
+    # are computed in log space and rescaled so large n does not overflow.
+    j = np.arange(n)
+    log_comb = gammaln(n) - gammaln(j + 1) - gammaln(n - j)
+    return (-1.0) ** j * np.exp(log_comb - log_comb.max())
+
+
+@lru_cache(maxsize=16)
+def lagrange_basis(n, points_limit):
+    basis = lagrange_basis_matrix(
+        np.arange(n, dtype=float),
+        np.linspace(0, n - 1, points_limit),
+        equispaced_weights(n),
+    )
+    basis.setflags(write=False)
+    return basis
+
+
+def lagrange_interpolation(x, y, x_interp):
+    return lagrange_basis_matrix(np.asarray(x, float), x_interp) @ y
+
+
+def nifs3_spline(points):
+    # One parametric fit for both coordinates, parametrised by node index.
+    n = len(points)
+    tck, _ = interpolate.splprep(points.T, u=np.arange(n), k=min(n - 1, 3), s=0)
+    return tck
+
+
+def evaluate_nifs3(tck, t):
+    return np.column_stack(interpolate.splev(t, tck))
+
+
+def nifs3_bounds(tck, n):
+    t = [0.0, n - 1.0] + spline_extrema(*tck)
+    return point_bounds(evaluate_nifs3(tck, np.clip(t, 0.0, n - 1.0)))
+
+
+def interpolate_curve_nifs3(x, y, steps=1000):
+    points = np.column_stack((x, y)).astype(float)
+    if len(points) == 1:
+        return points
+    return evaluate_nifs3(nifs3_spline(points), np.linspace(0, len(points) - 1, steps))
+
+
+class NIFS3Model(CurveModel):
+    def __init__(self, control_points=(), points_limit=1000, **kwargs):
+        super().__init__(control_points, points_limit, **kwargs)
+        self._spline = None
+
+    def _get_spline(self, points):
+        # Refit only when a node actually moved, not on every revision bump
+        # (points_limit, tessellation mode or zoom level changes). The nodes
+        # and fit are swapped as one tuple, as worker threads refit too.
+        spline = self._spline
+        if spline is None or not np.array_equal(points, spline[0]):
+            spline = (points.copy(), nifs3_spline(points))
+            self._spline = spline
+        return spline[1]
+
+    def _uniform_points(self, points, count):
+        if len(points) == 1:
+            return points
+        t = np.linspace(0, len(points) - 1, count)
+        return evaluate_nifs3(self._get_spline(points), t)
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        if len(points) == 1:
+            return points
+        tck = self._get_spline(points)
+        scale = len(points) - 1
+        return adaptive_samples(
+            lambda t: evaluate_nifs3(tck, t * scale),
+            tolerance,
+            max_points,
+            4 * len(points),
+        )
+
+    def _curve_bounds(self, points):
+        if len(points) == 1:
+            return point_bounds(points)
+        return nifs3_bounds(self._get_spline(points), len(points))
+
+    def _extent_bounds(self, points):
+        # The fitted spline stays inside the hull of its B-spline coefficients.
+        if len(points) == 1:
+            return point_bounds(points)
+        return point_bounds(np.column_stack(self._get_spline(points)[1]))
+
+
+class LagrangeModel(CurveModel):
+    def _uniform_points(self, points, count):
+        return lagrange_basis(len(points), count) @ points
+
+    def _adaptive_points(self, points, tolerance, max_points):
+        nodes = np.arange(len(points), dtype=float)
+        weights = equispaced_weights(len(points))
+        return adaptive_samples(
+            lambda t: lagrange_basis_matrix(nodes, t * nodes[-1], weights) @ points,
+            tolerance,
+            max_points,
+            4 * len(points),
+        )
+
+    def _curve_bounds(self, points):
+        n = len(points)
+        if n == 1:
+            return point_bounds(points)
+        if n - 1 > MAX_BOUNDS_DEGREE:
+            # No hull property to fall back on, so bound the dense sampling.
+            return point_bounds(self._uniform_points(points, self.points_limit))
+        nodes = np.arange(n, dtype=float)
+        weights = equispaced_weights(n)
+        return polynomial_bounds(
+            lambda t: lagrange_basis_matrix(nodes, t, weights) @ points,
+            n - 1,
+            (0.0, n - 1.0),
+        )
@@ -1,18 +1,38 @@
-from PyQt6.QtCore import QRectF, Qt, QPointF
-from PyQt6.QtGui import QPen, QColor, QPainterPath
-from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtCore import QRectF, QPointF
+from PyQt6.QtGui import QPen, QColor, QPolygonF
+from PyQt6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
 
-from scipy.spatial import ConvexHull
+from curves.base import CurveModel, scale_detail_level
 import numpy as np
 
 
-class Curve(QGraphicsItem):
+def to_polygon(points):
+    # Copies an (N, 2) array straight into the QPolygonF storage, which is a
+    # contiguous run of (x, y) doubles, instead of building QPointF objects.
+    points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+    polygon = QPolygonF()
+    # fill() also resizes and, unlike resize(), is wrapped by all PyQt6 releases.
+    polygon.fill(QPointF(), len(points))
+    if len(points):
+        buffer = polygon.data()
+        buffer.setsize(points.nbytes)
+        np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)[:] = points
+    return polygon
+
+
+class Curve(CurveModel, QGraphicsItem):
+    # Draws a curve model in the scene. The curve math and caches live in the
+    # model; this adds the pens and the Qt polygons that get painted.
     def __init__(self, control_points, points_limit=1000, props=None, parent=None):
-        super().__init__()
+        self._painted_polygon = None
+        self._painted_revision = -1
+        self._painted_rect = QRectF()
+        self._polygons_revision = None
+        self._polygons = {}
+        self._extent_revision = None
+        self._extent = None
+        super().__init__(control_points, points_limit)
         self.parent = parent
-        self.control_points = control_points
-        self.points_limit = points_limit
-        self.points = []
 
         self.point_pen = QPen(QColor(79, 106, 25), 5)
         self.line_pen = QPen(QColor(79, 106, 25), 1)
@@ -22,54 +42,52 @@ class Curve(QGraphicsItem):
             self.line_pen.setColor(QColor.fromRgb(*props["line_color"]))
             self.line_pen.setWidth(props["line_size"])
 
-        self.leftmost_x = 0.0
-        self.rightmost_x = 0.0
-        self.highest_y = 0.0
-        self.lowest_y = 0.0
-
         self.show_bounding_rect = False
         self.show_control_line = False
         self.show_convex_hull = False
         self.show_points = True
-        self.closed = False
 
-        self.current_rotation = None
+    def control_polygon(self):
+        return to_polygon(self.control_points)
+
+    def get_extent(self):
+        # Rectangle covering the curve and its control points, kept cached as
+        # Qt asks for it very often.
+        if self._extent_revision != self.revision:
+            x0, y0, x1, y1 = self.get_extent_bounds()
+            self._extent = QRectF(x0, y0, x1 - x0, y1 - y0)
+            self._extent_revision = self.revision
+        return self._extent
 
-        self.bounding_cords = [
-            self.leftmost_x,
-            self.rightmost_x,
-            self.highest_y,
-            self.lowest_y,
-        ]
+    def curve_rect(self):
+        x0, y0, x1, y1 = self.get_bounds()
+        return QRectF(x0, y0, x1 - x0, y1 - y0)
 
     def boundingRect(self):
-        return QRectF(
-            self.leftmost_x,
-            self.highest_y,
-            abs(self.leftmost_x - self.rightmost_x),
-            abs(self.highest_y - self.lowest_y),
-        )
+        # Covers the curve, the control points, control line and hull, plus
+        # the pen widths, so the scene index can cull the item.
+        margin = max(self.point_pen.widthF(), self.line_pen.widthF()) / 2 + 1
+        extent = self.get_extent()
+        if self._slow_tessellation:
+            # May still be showing a polygon from before the last edits.
+            extent = extent.united(self._painted_rect)
+        return extent.adjusted(-margin, -margin, margin, margin)
 
     def paint(self, painter, option, widget=None):
-        if self.control_points:
+        if len(self.control_points):
             painter.setPen(self.point_pen)
             painter.setBrush(self.point_pen.brush())
             if self.show_points:
-                painter.drawPoints(self.control_points)
+                painter.drawPoints(self.control_polygon())
 
             painter.setPen(self.line_pen)
             painter.setBrush(self.line_pen.brush())
 
-            self._get_points()
-
-            path = QPainterPath(self._points[0])
-            for i in range(1, len(self._points)):
-                path.lineTo(self._points[i])
-            painter.strokePath(path, self.line_pen)
+            painter.drawPolyline(self.painted_polygon(self.detail_level(painter)))
 
             if self.show_bounding_rect:
-                painter.drawPoint(self.boundingRect().center())
-                painter.drawRect(self.boundingRect())
+                painter.drawPoint(self.curve_rect().center())
+                painter.drawRect(self.curve_rect())
 
             if self.show_control_line:
                 self.paint_control_curve(painter)
@@ -77,89 +95,77 @@ class Curve(QGraphicsItem):
             if self.show_convex_hull:
                 self.paint_convex_hull(painter)
 
-    def _get_points(self):
-        self._points = self.control_points
-        return self.control_points
+    def invalidate(self, keep_points=False):
+        self.prepareGeometryChange()
+        super().invalidate(keep_points)
+        point_index = getattr(self.scene(), "point_index", None)
+        if point_index is not None:
+            point_index.mark_dirty(self)
+        if self._slow_tessellation:
+            pool = self.tessellation_pool()
+            if pool is not None:
+                pool.cancel_stale(self)
+        self.update()
+
+    def detail_level(self, painter):
+        return scale_detail_level(
+            QStyleOptionGraphicsItem.levelOfDetailFromTransform(
+                painter.worldTransform()
+            )
+        )
+
+    def store_points(self, revision, level, points):
+        # Background results are shown as long as they are newer than the
+        # polygon on screen. After a failed job paint() redoes the sampling
+        # and so raises in the GUI thread.
+        super().store_points(revision, level, points)
+        if points is None:
+            self.update()
+        elif revision >= self._painted_revision:
+            self.prepareGeometryChange()
+            self._painted_polygon = to_polygon(points)
+            self._painted_revision = revision
+            self._painted_rect = self._painted_polygon.boundingRect()
+            self.update()
+
+    def tessellation_pool(self):
+        return getattr(self.scene(), "tessellation_pool", None)
+
+    def painted_polygon(self, level=0):
+        # Slow curves are sampled on the pool and keep showing the polygon of
+        # their last completed tessellation until store_points() swaps it in.
+        if (
+            self._slow_tessellation
+            and self._painted_polygon is not None
+            and not self.has_points(level)
+        ):
+            pool = self.tessellation_pool()
+            if pool is not None:
+                pool.submit(self, level)
+                return self._painted_polygon
+        polygon = self.get_polygon(level)
+        if self._painted_revision < self.revision:
+            # Lies inside the current extent, so the bounding rect holds.
+            self._painted_polygon = polygon
+            self._painted_revision = self.revision
+            self._painted_rect = self.get_extent()
+        return polygon
+
+    def get_polygon(self, level=0):
+        if self._polygons_revision != self.revision:
+            self._polygons = {}
+            self._polygons_revision = self.revision
+        if level not in self._polygons:
+            self._polygons[level] = to_polygon(self.get_points(level))
+        return self._polygons[level]
 
     def paint_control_curve(self, painter):
 
         painter.setPen(QPen(QColor(255, 120, 65), 1))
-        for i in range(1, len(self.control_points)):
-            painter.drawLine(self.control_points[i - 1], self.control_points[i])
+        painter.drawPolyline(self.control_polygon())
 
     def paint_convex_hull(self, painter):
         if len(self.control_points) < 3:
             return
-        hull = ConvexHull(
-            [
-                (self.control_points[i].x(), self.control_points[i].y())
-                for i in range(len(self.control_points))
-            ]
-        )
         painter.setPen(QPen(QColor(178, 34, 34), 1))
-        for i in range(len(hull.vertices)):
-            painter.drawLine(
-                self.control_points[hull.vertices[i - 1]],
-                self.control_points[hull.vertices[i]],
-            )
-
-    def rotate_points(self, target_deg):
-        if self.current_rotation == None:
-            self.current_rotation = target_deg
-        else:
-            temp = target_deg
-            diff = self.current_rotation - target_deg
-            target_deg = diff
-            self.current_rotation = temp
-        cp = np.array(
-            [self.boundingRect().center().x(), self.boundingRect().center().y()]
-        )
-        points = np.array([(x.x(), x.y()) for x in self.control_points])
-        angle_rad = np.radians(target_deg)
-
-        translated_points = points - cp
-
-        rotated_points = np.empty_like(translated_points)
-        rotated_points[:, 0] = translated_points[:, 0] * np.cos(
-            angle_rad
-        ) - translated_points[:, 1] * np.sin(angle_rad)
-        rotated_points[:, 1] = translated_points[:, 0] * np.sin(
-            angle_rad
-        ) + translated_points[:, 1] * np.cos(angle_rad)
-
-        rotated_points += cp
-
-        self.control_points = [QPointF(p[0], p[1]) for p in rotated_points]
-        self.update()
-
-        return
-
-    def add_control_point(self, point):
-
-        if len(self.control_points) == 0:
-            self.leftmost_x = point.x()
-            self.rightmost_x = point.x()
-            self.highest_y = point.y()
-            self.lowest_y = point.y()
-
-        self.leftmost_x = min(self.leftmost_x, point.x())
-        self.rightmost_x = max(self.rightmost_x, point.x())
-        self.highest_y = min(self.highest_y, point.y())
-        self.lowest_y = max(self.lowest_y, point.y())
-
-        self.control_points.append(point)
-
-    def add_diff(self, diff, diff_x, diff_y):
-        for i in range(len(self.control_points)):
-            self.control_points[i] += diff
-
-        self.leftmost_x += diff_x
-        self.rightmost_x += diff_x
-        self.highest_y += diff_y
-        self.lowest_y += diff_y
-
-    def get_type(self):
-        return self.name.split("-")[1]
-
-    def get_id(self):
-        return self.name.split("-")[0]
+        painter.drawPolygon(to_polygon(self.get_convex_hull()))
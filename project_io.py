@@ -0,0 +1,169 @@
+import json
+import pickle
+import struct
+import numpy as np
+
+# File layout: magic, little-endian u32 version and header length, a JSON
+# header with per-curve metadata, then (8-byte aligned) the point and weight
+# offset tables as int64[n + 1] and all points and weights as float64 columns.
+PROJECT_MAGIC = b"CURVPROJ"
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = ".curves"
+
+# Curve attributes stored in the header, when the curve type has them.
+CURVE_SETTINGS = (
+    "points_limit",
+    "tessellation",
+    "tolerance",
+    "degree",
+    "evaluation",
+    "show_points",
+    "show_control_line",
+    "show_convex_hull",
+    "show_bounding_rect",
+    "show_weight_points",
+    "nodes",
+)
+
+
+def curve_props(curve):
+    return {
+        "point_color": curve.point_pen.color().getRgb(),
+        "point_size": curve.point_pen.width(),
+        "line_color": curve.line_pen.color().getRgb(),
+        "line_size": curve.line_pen.width(),
+    }
+
+
+def curve_settings(curve):
+    return {key: getattr(curve, key) for key in CURVE_SETTINGS if hasattr(curve, key)}
+
+
+def apply_settings(curve, settings, weights=None):
+    # Only differing values are assigned, as most setters drop the curve caches.
+    for key, value in settings.items():
+        if hasattr(curve, key) and getattr(curve, key) != value:
+            setattr(curve, key, value)
+    if weights is not None and hasattr(curve, "weights"):
+        if len(weights) == len(curve.control_points):
+            curve.weights = np.array(weights)
+
+
+def offsets(arrays):
+    table = np.zeros(len(arrays) + 1, dtype="<i8")
+    np.cumsum([len(a) for a in arrays], out=table[1:])
+    return table
+
+
+def json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not serializable")
+
+
+def write_project(file_name, curves):
+    curves = list(curves)
+    points = [curve.control_points for curve in curves]
+    weights = [np.asarray(getattr(curve, "weights", ()), float) for curve in curves]
+    header = {
+        "curves": [
+            {
+                "name": curve.name,
+                "props": curve_props(curve),
+                "settings": curve_settings(curve),
+            }
+            for curve in curves
+        ],
+        "points": sum(map(len, points)),
+        "weights": sum(map(len, weights)),
+    }
+    header = json.dumps(header, default=json_value).encode()
+    padding = -(len(PROJECT_MAGIC) + 8 + len(header)) % 8
+
+    with open(file_name, "wb") as f:
+        f.write(PROJECT_MAGIC)
+        f.write(struct.pack("<II", PROJECT_VERSION, len(header)))
+        f.write(header + b"\0" * padding)
+        f.write(offsets(points).tobytes())
+        f.write(offsets(weights).tobytes())
+        for column in points:
+            f.write(np.ascontiguousarray(column, dtype="<f8").tobytes())
+        for column in weights:
+            f.write(column.astype("<f8").tobytes())
+
+
+def map_column(file_name, dtype, offset, shape):
+    if 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    # Plain ndarray view, as slicing np.memmap itself is slow per curve.
+    column = np.memmap(file_name, dtype=dtype, mode="c", offset=offset, shape=shape)
+    return column.view(np.ndarray)
+
+
+def read_project(file_name):
+    # Returns (name, points, props, settings, weights) per curve; points and
+    # weights are views into one copy-on-write memory map of the file.
+    with open(file_name, "rb") as f:
+        magic = f.read(len(PROJECT_MAGIC))
+        if magic != PROJECT_MAGIC:
+            return import_legacy_project(file_name)
+        version, length = struct.unpack("<II", f.read(8))
+        if version > PROJECT_VERSION:
+            raise ValueError(
+                f"{file_name} uses project format {version}, "
+                f"newer than the supported {PROJECT_VERSION}"
+            )
+        header = json.loads(f.read(length))
+
+    offset = len(PROJECT_MAGIC) + 8 + length
+    offset += -offset % 8
+    count = len(header["curves"])
+    point_offsets = map_column(file_name, "<i8", offset, (count + 1,))
+    offset += 8 * (count + 1)
+    weight_offsets = map_column(file_name, "<i8", offset, (count + 1,))
+    offset += 8 * (count + 1)
+    points = map_column(file_name, "<f8", offset, (header["points"], 2))
+    offset += 16 * header["points"]
+    weights = map_column(file_name, "<f8", offset, (header["weights"],))
+
+    point_offsets = point_offsets.tolist()
+    weight_offsets = weight_offsets.tolist()
+    return [
+        (
+            curve["name"],
+            points[point_offsets[i] : point_offsets[i + 1]],
+            curve["props"],
+            curve["settings"],
+            (
+                weights[weight_offsets[i] : weight_offsets[i + 1]]
+                if weight_offsets[i + 1] > weight_offsets[i]
+                else None
+            ),
+        )
+        for i, curve in enumerate(header["curves"])
+    ]
+
+
+def unpickle_point(module, name, args):
+    if (module, name) != ("PyQt6.QtCore", "QPointF"):
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a project")
+    return args
+
+
+class LegacyUnpickler(pickle.Unpickler):
+    # Old projects only pickle QPointF, either directly or through sip; those
+    # are read as plain (x, y) tuples and any other global is refused.
+    def find_class(self, module, name):
+        if (module, name) == ("PyQt6.sip", "_unpickle_type"):
+            return unpickle_point
+        if (module, name) == ("PyQt6.QtCore", "QPointF"):
+            return lambda *args: args
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a project")
+
+
+def import_legacy_project(file_name):
+    with open(file_name, "rb") as f:
+        project = LegacyUnpickler(f).load()
+    return [
+        (name, points, props, {}, None) for name, (points, props) in project.items()
+    ]
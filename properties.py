@@ -1,30 +1,40 @@
-from PyQt6.QtCore import Qt, QModelIndex, QVariant, QAbstractItemModel, QPointF
+from PyQt6.QtCore import Qt, QModelIndex, QVariant, QAbstractItemModel
 from PyQt6.QtGui import QColor
+import numpy as np
+
+# Point and weight rows are handed to the view in batches of this size.
+FETCH_BATCH = 256
+
+CURVE_PROPERTIES = [
+    ("Name", lambda curve: curve.name),
+    ("Type", lambda curve: curve.get_type()),
+    ("Points limit", lambda curve: curve.points_limit),
+    ("Tessellation", lambda curve: curve.tessellation),
+    ("Tolerance", lambda curve: curve.tolerance),
+    ("Line Color", lambda curve: curve.line_pen.color()),
+    ("Line Width", lambda curve: curve.line_pen.width()),
+    ("Marker Color", lambda curve: curve.point_pen.color()),
+    ("Marker Size", lambda curve: curve.point_pen.width()),
+    ("Show Control Line", lambda curve: curve.show_control_line),
+    ("Show Convex Hull", lambda curve: curve.show_convex_hull),
+    ("Show Control Points", lambda curve: curve.show_points),
+]
 
 
 class CurvePropertiesModel(QAbstractItemModel):
+    # Rows are not stored: data() formats them from the curve when the view
+    # asks, and point rows are only exposed as the view scrolls to them.
     def __init__(self, curve=None, parent=None):
         super().__init__()
         self.parentt = parent
-        if curve != None:
-            self.properties = [
-                ("Name", curve.name),
-                ("Points limit", curve.points_limit),
-                ("Line Color", curve.line_pen.color()),
-                ("Line Width", curve.line_pen.width()),
-                ("Marker Color", curve.point_pen.color()),
-                ("Marker Size", curve.point_pen.width()),
-                ("Points:", ""),
-                *[
-                    (
-                        "point" + str(i),
-                        str((curve.control_points[i].x(), curve.control_points[i].y())),
-                    )
-                    for i in range(len(curve.control_points))
-                ],
-            ]
-        else:
-            self.properties = []
+        self.curve = None
+        self.head = []
+        self.total = 0
+        self.fetched = 0
+        # Values last reported to the view, to tell which rows changed.
+        self.shown_points = np.zeros((0, 2))
+        self.shown_weights = np.zeros(0)
+        self.setCurve(curve)
 
     def index(self, row, column, parent=QModelIndex()):
         if not self.hasIndex(row, column, parent):
@@ -40,87 +50,147 @@ class CurvePropertiesModel(QAbstractItemModel):
 
     def rowCount(self, parent=QModelIndex()):
         if not parent.isValid():
-            return len(self.properties)
+            return self.fetched
 
         return 0
 
     def columnCount(self, parent=QModelIndex()):
         return 2
 
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.fetched < self.total
+
+    def fetchMore(self, parent):
+        count = min(FETCH_BATCH, self.total - self.fetched)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+
+    def show_weights(self, curve):
+        return curve.get_type() == "WeightedBezier" and len(curve.weights)
+
+    def head_properties(self, curve):
+        head = list(CURVE_PROPERTIES)
+        if "BSpline" in curve.get_type():
+            head.append(("Degree", lambda curve: curve.degree))
+        if curve.get_type() == "Bezier":
+            head.append(("Evaluation", lambda curve: curve.evaluation))
+        return head
+
+    def total_rows(self, curve):
+        rows = len(self.head_properties(curve)) + 1 + len(curve.control_points)
+        if self.show_weights(curve):
+            rows += 1 + len(curve.weights)
+        return rows
+
+    def row_property(self, row):
+        curve = self.curve
+        if row < len(self.head):
+            name, value = self.head[row]
+            return name, value(curve)
+        row -= len(self.head)
+        if row == 0:
+            return "Points:", ""
+        row -= 1
+        points = curve.control_points
+        if row < len(points):
+            return "control_point" + str(row), str(tuple(points[row].tolist()))
+        row -= len(points)
+        if row == 0:
+            return "Weights:", ""
+        return "weight" + str(row - 1), str(curve.weights[row - 1])
+
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if not index.isValid():
             return QVariant()
 
         if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
-            if index.column() == 0:
-                return self.properties[index.row()][0]
-            elif index.column() == 1:
-                return self.properties[index.row()][1]
+            return self.row_property(index.row())[index.column()]
 
         return QVariant()
 
-    def setCurve(self, curve):
-        if curve == None:
-            self.properties = []
-            self.curve = None
+    def remember_values(self, curve):
+        if curve is None:
+            self.shown_points = np.zeros((0, 2))
+            self.shown_weights = np.zeros(0)
             return
-        self.curve = curve
+        self.shown_points = curve.control_points.copy()
+        if self.show_weights(curve):
+            self.shown_weights = np.array(curve.weights, dtype=float)
+
+    def emit_changed_rows(self, first_row, changed):
+        # One dataChanged per run of consecutive changed rows the view has.
+        rows = first_row + changed
+        rows = rows[rows < self.fetched]
+        if len(rows) == 0:
+            return
+        breaks = np.flatnonzero(np.diff(rows) > 1)
+        starts = rows[np.append(0, breaks + 1)].tolist()
+        ends = rows[np.append(breaks, len(rows) - 1)].tolist()
+        for start, end in zip(starts, ends):
+            self.dataChanged.emit(self.index(start, 1), self.index(end, 1))
 
-        self.properties = [
-            ("Name", curve.name),
-            ("Type", curve.get_type()),
-            ("Points limit", curve.points_limit),
-            ("Line Color", curve.line_pen.color()),
-            ("Line Width", curve.line_pen.width()),
-            ("Marker Color", curve.point_pen.color()),
-            ("Marker Size", curve.point_pen.width()),
-            ("Show Control Line", curve.show_control_line),
-            ("Show Convex Hull", curve.show_convex_hull),
-            ("Show Control Points", curve.show_points),
-            ("Points:", ""),
-            *[
-                (
-                    "control_point" + str(i),
-                    str((curve.control_points[i].x(), curve.control_points[i].y())),
-                )
-                for i in range(len(curve.control_points))
-            ],
-        ]
-        if self.curve.get_type() == "WeightedBezier" and len(curve.weights):
-            self.properties.append(("Weights:", ""))
-            self.properties.extend(
-                [
-                    (
-                        "weight" + str(i),
-                        str((curve.weights[i])),
-                    )
-                    for i in range(len(curve.weights))
-                ]
-            )
-
-        if "BSpline" in self.curve.get_type():
-            self.properties.append(("Degree", curve.degree))
+    def setCurve(self, curve):
+        # Refreshing the same curve with the same rows only reports the point
+        # and weight rows whose values changed, e.g. the dragged point's row;
+        # the other rows only change through setData. Anything else resets
+        # the model.
+        if curve is not None and curve is self.curve:
+            total = self.total_rows(curve)
+            if total == self.total:
+                points = curve.control_points
+                first_row = len(self.head) + 1
+                changed = np.flatnonzero((points != self.shown_points).any(axis=1))
+                self.emit_changed_rows(first_row, changed)
+                if self.show_weights(curve):
+                    weights = np.asarray(curve.weights)
+                    changed = np.flatnonzero(weights != self.shown_weights)
+                    self.emit_changed_rows(first_row + len(points) + 1, changed)
+                self.remember_values(curve)
+                return
+            fetched = max(self.fetched, FETCH_BATCH)
+        else:
+            fetched = FETCH_BATCH
+
+        self.beginResetModel()
+        self.curve = curve
+        if curve is None:
+            self.head = []
+            self.total = 0
+        else:
+            self.head = self.head_properties(curve)
+            self.total = self.total_rows(curve)
+        self.fetched = min(self.total, fetched)
+        self.remember_values(curve)
+        self.endResetModel()
 
     def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
         if index.isValid() and role == Qt.ItemDataRole.EditRole:
             row = index.row()
-            if 0 <= row < len(self.properties):
-                property_name, old_value = self.properties[row]
-                self.properties[row] = (property_name, value)
-                self.dataChanged.emit(index, index, [role])
+            if 0 <= row < self.fetched:
+                property_name, old_value = self.row_property(row)
 
                 if self.curve is not None:
                     if property_name == "Name":
                         self.curve.name = value
                     elif property_name == "Points limit":
                         self.curve.points_limit = value
+                    elif property_name == "Tessellation":
+                        if value in self.curve.tessellation_modes:
+                            self.curve.tessellation = value
+                    elif property_name == "Tolerance":
+                        self.curve.tolerance = float(value)
                     elif property_name == "Line Color":
                         self.curve.line_pen.setColor(QColor.fromString(value))
                     elif property_name == "Line Width":
+                        self.curve.prepareGeometryChange()
                         self.curve.line_pen.setWidth(int(value))
                     elif property_name == "Marker Color":
                         self.curve.point_pen.setColor(QColor.fromString(value))
                     elif property_name == "Marker Size":
+                        self.curve.prepareGeometryChange()
                         self.curve.point_pen.setWidth(int(value))
                     elif property_name == "Show Convex Hull":
                         self.curve.show_convex_hull = bool(value)
@@ -130,17 +200,22 @@ class CurvePropertiesModel(QAbstractItemModel):
                         self.curve.show_points = bool(value)
                     elif property_name == "Degree":
                         self.curve.degree = int(value)
+                    elif property_name == "Evaluation":
+                        if value in self.curve.evaluation_modes:
+                            self.curve.evaluation = value
                     elif property_name == "Type":
                         cp = self.curve.control_points.copy()
                         name = self.curve.get_id() + "-" + value
                         self.parentt.scene.remove_current_object()
                         self.parentt.scene.add_object(name, cp)
-                        self.curve = self.parentt.scene.current_object
+                        self.setCurve(self.parentt.scene.current_object)
                         self.parentt.ui.update()
+                        return True
                     elif "control_point" in property_name:
                         value = eval(value)
-                        self.curve.control_points[int(property_name[5:])] = QPointF(
-                            value[0], value[1]
+                        idx = int(property_name[13:])
+                        self.curve.move_control_point(
+                            idx, np.subtract(value, self.curve.control_points[idx])
                         )
                     elif "weight" in property_name:
                         value = eval(value)
@@ -148,6 +223,7 @@ class CurvePropertiesModel(QAbstractItemModel):
 
                     self.curve.update()
 
+                self.dataChanged.emit(index, index, [role])
                 return True
 
         return False
@@ -1,11 +1,19 @@
 from PyQt6.QtCore import pyqtSignal
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QRectF, QPointF, QTimer
 from PyQt6.QtGui import QMouseEvent
-from PyQt6.QtWidgets import QGraphicsScene, QGraphicsPixmapItem
+from PyQt6.QtWidgets import QGraphicsScene, QStyleOptionGraphicsItem
 from config import NAME_TO_CURVE_CLASS
+from graphics_items.curves.base import Curve, scale_detail_level
+from spatial import ControlPointGrid, SegmentIndex
+from tessellation import TessellationPool
 from math import degrees, atan2
 
+# Control point pick radius, in screen pixels.
+PICK_RADIUS = 3.0
+# Drag edits are applied at most this often, roughly once per frame.
+DRAG_INTERVAL_MS = 16
+
 
 class EditorScene(QGraphicsScene):
 
@@ -16,29 +24,116 @@ class EditorScene(QGraphicsScene):
         self.object_mapping = {}
         self.current_object = None
         self.image = None
+        self.point_index = ControlPointGrid()
+        self.segment_indexes = {}
+        self.tessellation_pool = TessellationPool(parent=self)
+
+        self.pending_diff = QPointF()
+        self.pending_rotation = None
+        self.drag_timer = QTimer(self)
+        self.drag_timer.setSingleShot(True)
+        self.drag_timer.setInterval(DRAG_INTERVAL_MS)
+        self.drag_timer.timeout.connect(self.apply_drag)
 
     def update_mode(self, mode):
         self.current_mode = mode
         self.moving = False
         self.rotating = False
+        self.drag_timer.stop()
+        self.pending_diff = QPointF()
+        self.pending_rotation = None
 
-    def add_object(self, name, control_points=None, props=None):
+    def create_object(self, name, control_points=None, props=None):
         curve_type = name.split("-")[1]
-        if control_points == None:
+        if control_points is None:
             obj = NAME_TO_CURVE_CLASS[curve_type]([], props=props, parent=self)
         else:
             obj = NAME_TO_CURVE_CLASS[curve_type](
                 control_points, props=props, parent=self
             )
+        obj.name = name
+        return obj
+
+    def add_object(self, name, control_points=None, props=None):
+        self.add_objects([self.create_object(name, control_points, props)])
+
+    def add_objects(self, objects):
+        # Nothing is tessellated here: curves sample themselves when first
+        # painted, so only the ones in view pay for it.
+        objects = list(objects)
+        for obj in objects:
+            self.addItem(obj)
+            self.object_mapping[obj.name] = obj
+            self.point_index.add(obj)
+        # Binned here in one pass, so the first click after loading is cheap.
+        self.point_index.refresh()
+        self.parent().ui.objects_widget.addItems([obj.name for obj in objects])
+        if objects:
+            self.current_object = objects[-1]
+
+    def view_scale(self, event):
+        if event.widget() is None:
+            return 1.0
+        return QStyleOptionGraphicsItem.levelOfDetailFromTransform(
+            event.widget().parent().transform()
+        )
+
+    def pick_point(self, event):
+        # The pick radius is kept constant on screen, whatever the zoom.
+        pos = event.scenePos()
+        radius = PICK_RADIUS / self.view_scale(event)
+        return self.point_index.nearest(pos.x(), pos.y(), radius)
+
+    def segment_index(self, obj, level):
+        # Built from the tessellation drawn at this zoom level and kept until
+        # the curve changes.
+        key = (obj.revision, level)
+        cached = self.segment_indexes.get(obj)
+        if cached is None or cached[0] != key:
+            cached = (key, SegmentIndex(obj.get_points(level)))
+            self.segment_indexes[obj] = cached
+        return cached[1]
+
+    def pick_curve(self, event):
+        # The scene's own index narrows the search down to curves whose
+        # bounds are near the click, then each one's segment index is asked.
+        pos = event.scenePos()
+        scale = self.view_scale(event)
+        radius = PICK_RADIUS / scale
+        level = scale_detail_level(scale)
+        area = QRectF(pos.x() - radius, pos.y() - radius, 2 * radius, 2 * radius)
+        best = None
+        for item in self.items(area):
+            if not isinstance(item, Curve) or len(item.control_points) == 0:
+                continue
+            distance = self.segment_index(item, level).distance(
+                pos.x(), pos.y(), radius
+            )
+            if distance < radius:
+                best, radius = item, distance
+        return best
 
-        self.current_object = obj
-        self.current_object.name = name
-        self.addItem(self.current_object)
-        self.parent().ui.objects_widget.addItem(name)
-        self.object_mapping[name] = obj
+    def select_object(self, obj):
+        # Goes through the objects list so selection follows the same path
+        # as clicking the curve's name there.
+        objects_widget = self.parent().ui.objects_widget
+        objects_widget.clearSelection()
+        objects_widget.setCurrentItem(
+            objects_widget.findItems(obj.name, Qt.MatchFlag.MatchExactly)[0]
+        )
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
 
+        if event.button() == Qt.MouseButton.LeftButton and self.current_mode in (
+            "None",
+            "Move",
+        ):
+            obj = self.pick_curve(event)
+            if obj is not None and (
+                obj is not self.current_object or self.current_mode == "None"
+            ):
+                self.select_object(obj)
+
         if (
             event.button() == Qt.MouseButton.LeftButton
             and self.current_mode == "Add curve points"
@@ -52,37 +147,20 @@ class EditorScene(QGraphicsScene):
             and self.current_mode == "Edit curve points"
         ):
             self.origin = event.scenePos()
-            for object in self.items():
-                if type(object) == QGraphicsPixmapItem:
-                    continue
-                for i, point in enumerate(object.control_points):
-                    diff = self.origin - point
-
-                    if diff.manhattanLength() < 3:
-                        self.selected_point_index = i
-                        self.current_object = object
-                        self.moving = True
-                        break
+            hit = self.pick_point(event)
+            if hit is not None:
+                self.current_object, self.selected_point_index = hit
+                self.moving = True
 
         if (
             event.button() == Qt.MouseButton.LeftButton
             and self.current_mode == "Remove curve points"
         ):
             self.origin = event.scenePos()
-            found = False
-            for object in self.items():
-                if type(object) == QGraphicsPixmapItem:
-                    continue
-                for i, point in enumerate(object.control_points):
-                    diff = self.origin - point
-
-                    if diff.manhattanLength() < 3:
-                        self.selected_point_index = i
-                        self.current_object = object
-                        found = True
-                        break
-            if found:
-                self.current_object.control_points.pop(self.selected_point_index)
+            hit = self.pick_point(event)
+            if hit is not None:
+                self.current_object, self.selected_point_index = hit
+                self.current_object.remove_control_point(self.selected_point_index)
                 self.update()
 
         if event.button() == Qt.MouseButton.LeftButton and self.current_mode == "Move":
@@ -94,35 +172,52 @@ class EditorScene(QGraphicsScene):
             self.origin = event.scenePos()
 
     def mouseMoveEvent(self, event):
-        if self.moving and self.current_mode == "Move":
-            pos = event.scenePos()
-            diff = pos - self.origin
-            diff_x = pos.x() - self.origin.x()
-            diff_y = pos.y() - self.origin.y()
-
-            self.current_object.add_diff(diff, diff_x, diff_y)
-            self.update()
+        # Moves only accumulate here; apply_drag edits the curve once per
+        # frame however fast the mouse reports.
+        if self.moving and self.current_mode in ("Move", "Edit curve points"):
+            self.pending_diff += event.scenePos() - self.origin
             self.origin = event.scenePos()
-
-        if self.moving and self.current_mode == "Edit curve points":
-            self.current_object.control_points[self.selected_point_index] += (
-                event.scenePos() - self.origin
-            )
-            self.origin = event.scenePos()
-            self.update()
+            if not self.drag_timer.isActive():
+                self.drag_timer.start()
 
         if self.rotating and self.current_mode == "Move":
             delta = event.scenePos() - self.origin
             rotation_angle = degrees(atan2(delta.y(), delta.x()))
             self.current_rotation = rotation_angle
-            self.current_object.rotate_points(rotation_angle)
+            self.pending_rotation = rotation_angle
+            if not self.drag_timer.isActive():
+                self.drag_timer.start()
 
         super().mouseMoveEvent(event)
 
+    def apply_drag(self):
+        if self.current_object is None:
+            return
+
+        # rotate_points tracks the angle it was last given, so only the
+        # latest one matters.
+        if self.pending_rotation is not None:
+            self.current_object.rotate_points(self.pending_rotation)
+            self.pending_rotation = None
+
+        diff = self.pending_diff
+        if diff.isNull():
+            return
+        self.pending_diff = QPointF()
+        if self.current_mode == "Move":
+            self.current_object.add_diff(diff, diff.x(), diff.y())
+        elif self.current_mode == "Edit curve points":
+            self.current_object.move_control_point(
+                self.selected_point_index, (diff.x(), diff.y())
+            )
+        self.update()
+
     def mouseReleaseEvent(self, event):
         if (self.rotating or self.moving) and (
             self.current_mode == "Move" or self.current_mode == "Edit curve points"
         ):
+            self.drag_timer.stop()
+            self.apply_drag()
             self.update()
             self.moving = False
             self.rotating = False
@@ -131,6 +226,9 @@ class EditorScene(QGraphicsScene):
 
     def remove_current_object(self):
         del self.object_mapping[self.current_object.name]
+        self.point_index.remove(self.current_object)
+        self.segment_indexes.pop(self.current_object, None)
+        self.tessellation_pool.discard(self.current_object)
         self.parent().ui.objects_widget.takeItem(
             self.parent().ui.objects_widget.row(
                 self.parent().ui.objects_widget.findItems(
@@ -161,6 +259,9 @@ class EditorScene(QGraphicsScene):
         if self.current_object == obj:
             self.current_object = None
         del self.object_mapping[obj.name]
+        self.point_index.remove(obj)
+        self.segment_indexes.pop(obj, None)
+        self.tessellation_pool.discard(obj)
         self.parent().ui.objects_widget.takeItem(
             self.parent().ui.objects_widget.row(
                 self.parent().ui.objects_widget.findItems(
@@ -171,6 +272,9 @@ class EditorScene(QGraphicsScene):
         self.removeItem(obj)
         self.update()
 
-    def update(self):
-        super().update(self.sceneRect())
+    def update(self, rect=None):
+        # Curves report their own old and new bounds when they change, so a
+        # repaint is only forced for an explicitly given region.
+        if rect is not None:
+            super().update(rect)
         self.update_occured.emit()
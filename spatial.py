@@ -0,0 +1,166 @@
+from collections import defaultdict
+from math import floor
+import numpy as np
+
+
+class ControlPointGrid:
+    # Uniform grid over the control points of every curve in the scene. Each
+    # cell maps a curve to the indices of its points inside that cell. Edited
+    # curves are only marked dirty and re-binned together on the next query,
+    # so drags do not pay for index updates and a query only pays for the
+    # curves changed since the last one.
+    def __init__(self, cell_size=32.0):
+        self.cell_size = cell_size
+        self.cells = defaultdict(dict)
+        self.curves = {}
+        self.dirty = set()
+
+    def add(self, curve):
+        self.curves[curve] = []
+        self.dirty.add(curve)
+
+    def mark_dirty(self, curve):
+        if curve in self.curves:
+            self.dirty.add(curve)
+
+    def remove(self, curve):
+        self._clear(curve, self.curves.pop(curve))
+        self.dirty.discard(curve)
+
+    def clear(self):
+        self.cells.clear()
+        self.curves.clear()
+        self.dirty.clear()
+
+    def _clear(self, curve, keys):
+        for key in keys:
+            cell = self.cells[key]
+            del cell[curve]
+            if not cell:
+                del self.cells[key]
+
+    def _insert(self, curves):
+        # Bins the pickable points of all given curves with one sort by
+        # curve, cell and index, then hands out each (curve, cell) run.
+        pairs = [(curve, curve.pickable_indices()) for curve in curves]
+        pairs = [(curve, indices) for curve, indices in pairs if len(indices)]
+        if not pairs:
+            return
+        curves, indices = zip(*pairs)
+        counts = np.array([len(i) for i in indices])
+        points = np.concatenate(
+            [curve.control_points[i] for curve, i in zip(curves, indices)]
+        )
+        owner = np.repeat(np.arange(len(curves)), counts)
+        local = np.concatenate(indices)
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        order = np.lexsort((local, cells[:, 1], cells[:, 0], owner))
+        owner, cells, local = owner[order], cells[order], local[order]
+        starts = np.flatnonzero(
+            np.concatenate(
+                ([True], (owner[1:] != owner[:-1]) | (cells[1:] != cells[:-1]).any(1))
+            )
+        )
+        ends = np.append(starts[1:], len(local))
+        for i, (x, y), start, end in zip(
+            owner[starts].tolist(), cells[starts].tolist(), starts, ends
+        ):
+            curve = curves[i]
+            key = (x, y)
+            self.cells[key][curve] = local[start:end]
+            self.curves[curve].append(key)
+
+    def refresh(self):
+        if not self.dirty:
+            return
+        for curve in self.dirty:
+            self._clear(curve, self.curves[curve])
+            self.curves[curve] = []
+        self._insert(self.dirty)
+        self.dirty.clear()
+
+    def nearest(self, x, y, radius):
+        # Closest control point to (x, y) within `radius` in Manhattan
+        # distance, as (curve, index), or None.
+        self.refresh()
+        size = self.cell_size
+        x0, x1 = floor((x - radius) / size), floor((x + radius) / size)
+        y0, y1 = floor((y - radius) / size), floor((y + radius) / size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            keys = [
+                key for key in self.cells if x0 <= key[0] <= x1 and y0 <= key[1] <= y1
+            ]
+        else:
+            keys = [
+                (i, j)
+                for i in range(x0, x1 + 1)
+                for j in range(y0, y1 + 1)
+                if (i, j) in self.cells
+            ]
+
+        best = None
+        best_distance = radius
+        for key in keys:
+            for curve, indices in self.cells[key].items():
+                distance = np.abs(curve.control_points[indices] - (x, y)).sum(axis=1)
+                i = distance.argmin()
+                if distance[i] < best_distance:
+                    best = (curve, int(indices[i]))
+                    best_distance = distance[i]
+        return best
+
+
+class SegmentIndex:
+    # Bounding volume hierarchy over a polyline. Leaves are boxes around runs
+    # of `chunk_size` consecutive segments and every level up merges pairs of
+    # neighbouring boxes, which stay tight because the polyline is continuous.
+    def __init__(self, points, chunk_size=16):
+        self.points = points
+        self.chunk_size = chunk_size
+        last = len(points) - 1
+        starts = np.arange(0, max(last, 1), chunk_size)
+        chunks = points[np.minimum(starts[:, None] + np.arange(chunk_size + 1), last)]
+        boxes = np.concatenate((chunks.min(axis=1), chunks.max(axis=1)), axis=1)
+        self.levels = [boxes]
+        while len(boxes) > 1:
+            if len(boxes) % 2:
+                boxes = np.vstack((boxes, boxes[-1:]))
+            pairs = boxes.reshape(-1, 2, 4)
+            boxes = np.concatenate(
+                (pairs[:, :, :2].min(axis=1), pairs[:, :, 2:].max(axis=1)), axis=1
+            )
+            self.levels.append(boxes)
+
+    def distance(self, x, y, radius):
+        # Distance from (x, y) to the polyline, or inf if it is further than
+        # `radius`; only boxes within `radius` of the point are descended into.
+        nodes = np.arange(len(self.levels[-1]))
+        for level in range(len(self.levels) - 1, -1, -1):
+            boxes = self.levels[level][nodes]
+            inside = (
+                (boxes[:, 0] - radius <= x)
+                & (x <= boxes[:, 2] + radius)
+                & (boxes[:, 1] - radius <= y)
+                & (y <= boxes[:, 3] + radius)
+            )
+            nodes = nodes[inside]
+            if len(nodes) == 0:
+                return np.inf
+            if level:
+                nodes = (2 * nodes[:, None] + (0, 1)).reshape(-1)
+                nodes = nodes[nodes < len(self.levels[level - 1])]
+
+        last = len(self.points) - 1
+        if last == 0:
+            return np.hypot(*(self.points[0] - (x, y)))
+        segments = (
+            nodes[:, None] * self.chunk_size + np.arange(self.chunk_size)
+        ).reshape(-1)
+        segments = segments[segments < last]
+        a, b = self.points[segments], self.points[segments + 1]
+        ab, ap = b - a, (x, y) - a
+        length = np.einsum("ij,ij->i", ab, ab)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(np.einsum("ij,ij->i", ap, ab) / length, 0.0, 1.0)
+        t[length == 0] = 0.0
+        return np.hypot(*(ap - t[:, None] * ab).T).min()
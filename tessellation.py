@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+import os
+
+
+class TessellationPool(QObject):
+    # Samples slow curves on worker threads; NumPy releases the GIL inside its
+    # kernels, so the GUI keeps running meanwhile. Results return to the GUI
+    # thread through a queued signal and the curve drops them if it was
+    # edited after the job was submitted.
+    finished = pyqtSignal(object, int, int, object)
+
+    def __init__(self, workers=None, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(
+            workers or os.cpu_count() or 1, thread_name_prefix="tessellation"
+        )
+        self.jobs = {}
+        self.finished.connect(self.deliver)
+
+    def submit(self, curve, level):
+        self.cancel_stale(curve)
+        jobs = self.jobs.setdefault(curve, {})
+        key = (curve.revision, level)
+        if key not in jobs:
+            # The worker samples a copy, as the GUI thread edits the control
+            # points in place.
+            jobs[key] = self.executor.submit(self.run, curve, curve.snapshot(), *key)
+
+    def run(self, curve, model, revision, level):
+        points = None
+        if curve.revision == revision:
+            try:
+                points = model._get_points(level)
+            except Exception:
+                # Left to the GUI thread to redo, so the error surfaces there.
+                pass
+        self.finished.emit(curve, revision, level, points)
+
+    def deliver(self, curve, revision, level, points):
+        jobs = self.jobs.get(curve)
+        if jobs is not None:
+            jobs.pop((revision, level), None)
+            if not jobs:
+                del self.jobs[curve]
+        curve.store_points(revision, level, points)
+
+    def cancel_stale(self, curve):
+        # Queued jobs for older revisions are cancelled; running ones finish
+        # and are dropped on delivery.
+        jobs = self.jobs.get(curve)
+        if jobs:
+            for key in [key for key in jobs if key[0] != curve.revision]:
+                if jobs[key].cancel():
+                    del jobs[key]
+
+    def discard(self, curve):
+        for future in self.jobs.pop(curve, {}).values():
+            future.cancel()
+
+    def shutdown(self):
+        self.jobs.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -14,11 +14,11 @@ from PyQt6.QtWidgets import (
     QSplitter,
     QGraphicsPixmapItem,
 )
-import pickle
 from PyQt6.QtGui import QColor, QAction, QPixmap
 from PyQt6.QtCore import pyqtSignal, Qt
 from widgets import QConnectedButton
 from config import NAME_TO_CURVE_CLASS
+from project_io import read_project, write_project, apply_settings, PROJECT_EXTENSION
 
 
 class EditorUI(QWidget):
@@ -67,6 +67,8 @@ class EditorUI(QWidget):
         self.left_splitter.addWidget(self.objects_widget)
         self.properties_widget = QTreeView()
         self.properties_widget.setHeaderHidden(True)
+        # Every row is one line, so the view never has to measure them all.
+        self.properties_widget.setUniformRowHeights(True)
         self.properties_widget.setEditTriggers(
             QAbstractItemView.EditTrigger.DoubleClicked
             | QAbstractItemView.EditTrigger.SelectedClicked
@@ -206,18 +208,24 @@ class EditorMenuBar(QMenuBar):
 
     def load_project(self):
         file_name, _ = QFileDialog.getOpenFileName(
-            self.parent().view, "Open File", "", "Pickle Files (*.pkl)"
+            self.parent().view,
+            "Open File",
+            "",
+            "Curve Projects (*.curves);;Legacy Pickle Files (*.pkl)",
         )
         if file_name:
-            with open(file_name, "rb") as f:
-                dd = pickle.load(f)
-                self.parent().scene.remove_all_objects()
-                for name, data in dd.items():
-                    control_points, props = data
-                    self.parent().scene.add_object(name, control_points, props=props)
-                self.parent().internal_counter = 1 + max(
-                    [int(k.split("-")[0]) for k in dd.keys()]
-                )
+            curves = read_project(file_name)
+            scene = self.parent().scene
+            scene.remove_all_objects()
+            objects = []
+            for name, control_points, props, settings, weights in curves:
+                obj = scene.create_object(name, control_points, props=props)
+                apply_settings(obj, settings, weights)
+                objects.append(obj)
+            scene.add_objects(objects)
+            self.parent().scene.parent().internal_counter = 1 + max(
+                [int(curve[0].split("-")[0]) for curve in curves], default=-1
+            )
 
     def new_project(self):
         dlg = QMessageBox(self)
@@ -231,31 +239,19 @@ class EditorMenuBar(QMenuBar):
 
         if button == QMessageBox.StandardButton.Yes:
             self.parent().scene.remove_all_objects()
-            self.parent().internal_counter = 0
+            self.parent().scene.parent().internal_counter = 0
         else:
             pass
 
     def save_project(self):
         file_name, _ = QFileDialog.getSaveFileName(
-            self.parent().view, "Save File", "", "Pickle Files (*.pkl)"
+            self.parent().view, "Save File", "", "Curve Projects (*.curves)"
         )
 
-        dd = {
-            k: (
-                v.control_points,
-                {
-                    "point_color": v.point_pen.color().getRgb(),
-                    "point_size": v.point_pen.width(),
-                    "line_color": v.line_pen.color().getRgb(),
-                    "line_size": v.line_pen.width(),
-                },
-            )
-            for k, v in self.parent().scene.object_mapping.items()
-        }
-
         if file_name:
-            with open(file_name, "wb") as f:
-                pickle.dump(dd, f)
+            if not file_name.endswith(PROJECT_EXTENSION):
+                file_name += PROJECT_EXTENSION
+            write_project(file_name, self.parent().scene.object_mapping.values())
 
     def load_image(self):
         file_name, _ = QFileDialog.getOpenFileName(
@@ -277,4 +273,5 @@ class EditorMenuBar(QMenuBar):
     def hide_all_points(self):
         for item in self.parent().scene.object_mapping.values():
             item.show_points = False
+            item.update()
         self.parent().scene.update()
@@ -7,7 +7,9 @@ class EditorView(QGraphicsView):
         super().__init__(parent)
         self._empty = True
         self.setRenderHint(QPainter.RenderHint.Antialiasing)
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        self.setViewportUpdateMode(
+            QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate
+        )
 
     def wheelEvent(self, event):
         if event.angleDelta().y() > 0: